@@ -0,0 +1,115 @@
+import logging
+import threading
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from core.utils import process_image
+from .cache import invalidate_profile
+from .models import Avatar
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_avatar_processing_setting(name, default=None):
+    return getattr(settings, 'AVATAR_PROCESSING', {}).get(name, default)
+
+
+def processes_in_background():
+    return get_avatar_processing_setting('MODE', 'sync') == 'background'
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_avatar_processing_setting('POOL_SIZE', 2),
+                thread_name_prefix='avatar',
+            )
+        return _executor
+
+
+def queue_avatar(avatar, image):
+    """
+    Store the raw upload and mark the avatar pending. The current url stays
+    in place until the WEBP is ready. With a pool configured the encode is
+    handed to it once the transaction commits; otherwise the pending row
+    waits for the process_avatars command.
+    """
+    avatar.source = image
+    avatar.status = 'pending'
+    avatar.save()
+
+    if get_avatar_processing_setting('POOL_SIZE', 2) > 0:
+        transaction.on_commit(lambda: get_executor().submit(run_in_worker, avatar.pk))
+    return avatar
+
+
+def run_in_worker(avatar_id):
+    try:
+        process_avatar(avatar_id)
+    except Exception:
+        logger.exception("Processing avatar %s failed", avatar_id)
+    finally:
+        close_old_connections()
+
+
+def process_avatar(avatar_id):
+    """
+    Encode the pending upload of an avatar and swap it in. Returns the new
+    status, or None when the avatar was not pending (already claimed).
+    """
+    claimed = Avatar.objects.filter(pk=avatar_id, status='pending').update(
+        status='processing', updated_at=timezone.now()
+    )
+    if not claimed:
+        return None
+
+    avatar = Avatar.objects.get(pk=avatar_id)
+    source = avatar.source.name
+
+    try:
+        url, sizes = process_image(
+            image_field=avatar.source, sizes=Avatar.SIZES, compress_quality=75, path='avatars/'
+        )
+    except (FileNotFoundError, ValueError, ValidationError):
+        url, sizes = None, {}
+    finally:
+        avatar.source.close()
+
+    # The swap only applies while the row still points at the upload we
+    # encoded; a newer upload in the meantime wins.
+    if url is None:
+        swapped = Avatar.objects.filter(pk=avatar_id, source=source).update(
+            source=None, status='failed', updated_at=timezone.now()
+        )
+    else:
+        swapped = Avatar.objects.filter(pk=avatar_id, source=source).update(
+            url=url, sizes=sizes, source=None, status='ready', updated_at=timezone.now()
+        )
+
+    # Encoded files are content-addressed and may be shared with other
+    # avatars, so an unused result is left to the media garbage collector.
+    if swapped:
+        default_storage.delete(source)
+
+    invalidate_profile(avatar.user_id)
+    return ('ready' if url else 'failed') if swapped else None
+
+
+def requeue_stale_avatars(stale_after):
+    """
+    Put avatars stuck in 'processing' for longer than ``stale_after``
+    seconds (a worker died mid-encode) back in the queue.
+    """
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    return Avatar.objects.filter(status='processing', updated_at__lt=cutoff).update(
+        status='pending', updated_at=timezone.now()
+    )
@@ -0,0 +1,145 @@
+import copy
+import time
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+
+
+def get_session_cache_setting(name, default):
+    return getattr(settings, 'SESSION_AUTH_CACHE', {}).get(name, default)
+
+
+class SessionCache:
+    """
+    Cache of resolved sessions: token -> (user, expires_at), kept for at
+    most TTL seconds.
+
+    By default it is a bounded in-process LRU, and an invalidation only
+    reaches the worker that made it; the others keep serving the entry until
+    its TTL runs out. When SHARED is enabled entries live in Django's cache
+    framework only, so an invalidation applies to every worker at once.
+    """
+
+    key_prefix = 'session_auth'
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._user_tokens = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return get_session_cache_setting('ENABLED', True)
+
+    @property
+    def max_size(self):
+        return get_session_cache_setting('MAX_SIZE', 10000)
+
+    @property
+    def ttl(self):
+        return get_session_cache_setting('TTL', 5)
+
+    @property
+    def shared(self):
+        return get_session_cache_setting('SHARED', False)
+
+    def _shared_key(self, token):
+        return f"{self.key_prefix}:{token}"
+
+    def get(self, token):
+        if not self.enabled:
+            return None
+
+        if self.shared:
+            return cache.get(self._shared_key(token))
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                user, expires_at, stored_at = entry
+                if now - stored_at < self.ttl:
+                    self._entries.move_to_end(token)
+                    return copy.copy(user), expires_at
+                self._pop(token)
+
+        return None
+
+    def set(self, token, user, expires_at):
+        if not self.enabled:
+            return
+
+        if self.shared:
+            cache.set(self._shared_key(token), (user, expires_at), self.ttl)
+        else:
+            self._store(token, user, expires_at)
+
+    async def aget(self, token):
+        # Only the shared cache is I/O; the in-process LRU is used as is.
+        if self.enabled and self.shared:
+            return await cache.aget(self._shared_key(token))
+        return self.get(token)
+
+    async def aset(self, token, user, expires_at):
+        if self.enabled and self.shared:
+            await cache.aset(self._shared_key(token), (user, expires_at), self.ttl)
+        else:
+            self.set(token, user, expires_at)
+
+    def _store(self, token, user, expires_at):
+        user = copy.copy(user)
+        with self._lock:
+            self._pop(token)
+            self._entries[token] = (user, expires_at, time.monotonic())
+            self._user_tokens.setdefault(user.pk, set()).add(token)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._pop(oldest)
+
+    def _pop(self, token):
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._user_tokens.get(entry[0].pk)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._user_tokens[entry[0].pk]
+
+    def invalidate(self, *tokens):
+        with self._lock:
+            for token in tokens:
+                self._pop(token)
+        if self.shared and tokens:
+            cache.delete_many([self._shared_key(token) for token in tokens])
+
+    def invalidate_user(self, user, tokens=()):
+        """
+        Drop every cached session of ``user``. ``tokens`` should hold the
+        user's tokens from the database so entries cached by other workers
+        in the shared cache are removed as well.
+        """
+        with self._lock:
+            known = set(self._user_tokens.get(user.pk, ()))
+        self.invalidate(*(known | set(tokens)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._user_tokens.clear()
+
+
+session_cache = SessionCache()
+
+
+def get_cached_profile(user_id):
+    return cache.get(f"profile:{user_id}")
+
+
+def set_cached_profile(user_id, data):
+    cache.set(f"profile:{user_id}", data, get_session_cache_setting('PROFILE_TTL', 60 * 60))
+
+
+def invalidate_profile(user_id):
+    cache.delete(f"profile:{user_id}")
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core import checks
+from core.cache import has_shared_cache
+
+
+@checks.register(checks.Tags.security)
+def check_signed_tokens(app_configs, **kwargs):
+    """
+    Signed session tokens are only checked against the revocation list in
+    the default cache, so a logout in one worker is invisible to the others
+    unless that cache is shared between them.
+    """
+    if getattr(settings, 'SESSION_TOKEN_FORMAT', 'uuid') != 'signed' or has_shared_cache():
+        return []
+    return [
+        checks.Error(
+            "SESSION_TOKEN_FORMAT = 'signed' requires a shared default cache.",
+            hint=(
+                "Revoked signed tokens stay valid in every other process while "
+                "CACHES['default'] is a local-memory or dummy cache. Point it at "
+                "Redis or Memcached, or use SESSION_TOKEN_FORMAT = 'uuid'."
+            ),
+            id='authentication.E001',
+        )
+    ]
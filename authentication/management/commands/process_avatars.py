@@ -0,0 +1,80 @@
+import time
+from django.core.management.base import BaseCommand
+from django.core.exceptions import ValidationError
+from core.utils import process_image
+from authentication.avatars import process_avatar, requeue_stale_avatars
+from authentication.cache import invalidate_profile
+from authentication.models import Avatar
+
+
+class Command(BaseCommand):
+    help = (
+        "Encode pending avatar uploads. Runs once by default; with --loop it "
+        "keeps polling, acting as the queue worker for background processing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--loop', action='store_true', help="Keep polling for pending avatars.")
+        parser.add_argument('--sleep', type=float, default=2.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument(
+            '--stale-after', type=int, default=600,
+            help="Requeue avatars left 'processing' for longer than this many seconds."
+        )
+        parser.add_argument(
+            '--backfill-sizes', action='store_true',
+            help="Generate the resized copies of avatars uploaded before they existed, then exit."
+        )
+
+    def handle(self, *args, **options):
+        if options['backfill_sizes']:
+            return self.backfill_sizes(options['batch_size'])
+
+        while True:
+            requeued = requeue_stale_avatars(options['stale_after'])
+            if requeued:
+                self.stdout.write(f"Requeued {requeued} stale avatars.")
+
+            ids = list(
+                Avatar.objects.filter(status='pending')
+                .order_by('updated_at')
+                .values_list('pk', flat=True)[:options['batch_size']]
+            )
+            for avatar_id in ids:
+                result = process_avatar(avatar_id)
+                if result:
+                    self.stdout.write(f"Avatar {avatar_id}: {result}")
+
+            if not options['loop']:
+                break
+            if not ids:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS("Done."))
+
+    def backfill_sizes(self, batch_size):
+        last_id = 0
+        done = 0
+        while True:
+            avatars = list(
+                Avatar.objects.filter(pk__gt=last_id, status='ready', sizes={})
+                .exclude(url='').exclude(url=None)
+                .order_by('pk')[:batch_size]
+            )
+            if not avatars:
+                break
+
+            for avatar in avatars:
+                try:
+                    with avatar.url.open('rb') as image:
+                        url, sizes = process_image(image_field=image, sizes=Avatar.SIZES, path='avatars/')
+                except (FileNotFoundError, ValueError, ValidationError) as e:
+                    self.stdout.write(self.style.WARNING(f"Avatar {avatar.pk}: {e}"))
+                    continue
+
+                Avatar.objects.filter(pk=avatar.pk, url=avatar.url.name).update(url=url, sizes=sizes)
+                invalidate_profile(avatar.user_id)
+                done += 1
+            last_id = avatars[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(f"Generated sizes for {done} avatars."))
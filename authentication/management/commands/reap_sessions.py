@@ -0,0 +1,79 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.utils import timezone
+from authentication.models import UserSession
+from authentication.tokens import revoke_sessions
+
+
+def session_table_size():
+    table = UserSession._meta.db_table
+    if connection.vendor == 'mysql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT table_rows, data_length + index_length FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = %s",
+                [table]
+            )
+            rows, size = cursor.fetchone()
+        return f"~{rows} rows, {size / (1024 * 1024):.1f} MB"
+    return f"{UserSession.objects.count()} rows"
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired sessions in small batches, and optionally evict the "
+        "oldest live sessions of users above a per-user cap. Meant for cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0.1, help="Seconds to pause between batches.")
+        parser.add_argument(
+            '--max-sessions-per-user', type=int,
+            default=getattr(settings, 'MAX_SESSIONS_PER_USER', None),
+            help="Keep at most this many live sessions per user."
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        self.stdout.write(f"Before: {session_table_size()}")
+
+        # Each batch is its own short autocommit DELETE by primary key, so no
+        # long-running lock is held on the sessions table.
+        now = timezone.now()
+        expired = 0
+        while True:
+            ids = list(
+                UserSession.objects.filter(expires_at__lte=now)
+                .order_by('expires_at')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            expired += UserSession.objects.filter(id__in=ids).delete()[0]
+            if len(ids) < batch_size:
+                break
+            time.sleep(options['sleep'])
+
+        self.stdout.write(f"Deleted {expired} expired sessions.")
+
+        max_sessions = options['max_sessions_per_user']
+        if max_sessions:
+            over_cap = (
+                UserSession.objects.filter(expires_at__gt=now)
+                .values('user_id')
+                .annotate(sessions=Count('id'))
+                .filter(sessions__gt=max_sessions)
+                .values_list('user_id', flat=True)
+            )
+            evicted = 0
+            for user_id in over_cap.iterator():
+                sessions = UserSession.evict_oldest(user_id, max_sessions)
+                revoke_sessions(sessions)
+                evicted += len(sessions)
+            self.stdout.write(f"Evicted {evicted} sessions over the per-user cap of {max_sessions}.")
+
+        self.stdout.write(f"After: {session_table_size()}")
@@ -1,22 +1,128 @@
+from django.core import signing
 from django.utils import timezone
-from .models import UserSession
+from .models import UserSession, User
+from .cache import session_cache
+from .tokens import is_signed_token, read_signed_token, is_session_revoked, ais_session_revoked
 from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.authentication import BaseAuthentication
 
 class CustomSessionAuthentication(BaseAuthentication):
+    """
+    Authenticates the session_token cookie. authenticate() and its async
+    counterpart aauthenticate() share the checks below and only differ in
+    their database and cache calls.
+    """
+
+    def get_sessions(self):
+        return UserSession.objects.select_related('user', 'user__avatar', 'user__preferences')
+
+    def get_users(self):
+        return User.objects.select_related('avatar', 'preferences')
+
     def authenticate(self, request):
         session_token = request.COOKIES.get('session_token')
-        
+
+        if not session_token:
+            return None
+
+        if is_signed_token(session_token):
+            return self.authenticate_signed(session_token)
+
+        user = self.cached_user(session_cache.get(session_token))
+        if user is None:
+            try:
+                session = self.get_sessions().get(session_token=session_token)
+            except UserSession.DoesNotExist:
+                session = None
+            if self.is_expired(session):
+                session.delete()
+            user = self.check_session(session)
+            if user is not None:
+                session_cache.set(session_token, user, session.expires_at)
+        return (user, None)
+
+    def authenticate_signed(self, session_token):
+        user_id, session_id, expires_at = self.read_signed(session_token)
+        if is_session_revoked(session_id):
+            raise AuthenticationFailed('Invalid session token')
+
+        user = self.cached_user(session_cache.get(session_token))
+        if user is None:
+            try:
+                user = self.get_users().get(pk=user_id)
+            except User.DoesNotExist:
+                raise AuthenticationFailed('Invalid session token')
+            session_cache.set(session_token, user, expires_at)
+        return (user, None)
+
+    async def aauthenticate(self, request):
+        session_token = request.COOKIES.get('session_token')
+
         if not session_token:
             return None
 
+        if is_signed_token(session_token):
+            return await self.aauthenticate_signed(session_token)
+
+        user = self.cached_user(await session_cache.aget(session_token))
+        if user is None:
+            try:
+                session = await self.get_sessions().aget(session_token=session_token)
+            except UserSession.DoesNotExist:
+                session = None
+            if self.is_expired(session):
+                await session.adelete()
+            user = self.check_session(session)
+            if user is not None:
+                await session_cache.aset(session_token, user, session.expires_at)
+        return (user, None)
+
+    async def aauthenticate_signed(self, session_token):
+        user_id, session_id, expires_at = self.read_signed(session_token)
+        if await ais_session_revoked(session_id):
+            raise AuthenticationFailed('Invalid session token')
+
+        user = self.cached_user(await session_cache.aget(session_token))
+        if user is None:
+            try:
+                user = await self.get_users().aget(pk=user_id)
+            except User.DoesNotExist:
+                raise AuthenticationFailed('Invalid session token')
+            await session_cache.aset(session_token, user, expires_at)
+        return (user, None)
+
+    def read_signed(self, session_token):
+        # The signature and expiry are checked in memory, the deny-list by
+        # the caller; the session table is never read for signed tokens.
         try:
-            session = UserSession.objects.get(session_token=session_token)
-        except UserSession.DoesNotExist:
+            user_id, session_id, expires_at = read_signed_token(session_token)
+        except signing.BadSignature:
+            raise AuthenticationFailed('Invalid session token')
+
+        if expires_at <= timezone.now():
+            raise AuthenticationFailed('Session expired')
+
+        return user_id, session_id, expires_at
+
+    def cached_user(self, cached):
+        # An entry past the session's expiry is ignored; the lookup that
+        # follows replaces it, or rejects the session.
+        if cached is None:
+            return None
+
+        user, expires_at = cached
+        if expires_at > timezone.now():
+            return user
+        return None
+
+    def is_expired(self, session):
+        return session is not None and session.expires_at <= timezone.now()
+
+    def check_session(self, session):
+        if session is None:
             raise AuthenticationFailed('Invalid session token')
 
-        if session.expires_at > timezone.now():
-            return (session.user, None)
-        else:
-            session.delete()
-            raise AuthenticationFailed('Session expired')
\ No newline at end of file
+        if self.is_expired(session):
+            raise AuthenticationFailed('Session expired')
+
+        return session.user
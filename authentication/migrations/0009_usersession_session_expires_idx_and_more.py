@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0008_payment_payment_user_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['expires_at'], name='session_expires_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['user', 'expires_at'], name='session_user_expires_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:18
+
+import authentication.models.user
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0009_usersession_session_expires_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='avatar',
+            name='source',
+            field=models.FileField(blank=True, help_text='Raw upload waiting to be processed', null=True, upload_to=authentication.models.user.upload_raw_image),
+        ),
+        migrations.AddField(
+            model_name='avatar',
+            name='status',
+            field=models.CharField(choices=[('ready', 'Ready'), ('pending', 'Pending'), ('processing', 'Processing'), ('failed', 'Failed')], default='ready', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='avatar',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0010_avatar_processing_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='avatar',
+            name='sizes',
+            field=models.JSONField(blank=True, default=dict, help_text='Resized copies of url, by longest side in pixels'),
+        ),
+    ]
@@ -17,6 +17,9 @@ class Payment(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='payment_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"Payment #{self.id} - {self.user} - {self.amount} {self.currency}"
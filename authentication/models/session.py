@@ -2,6 +2,7 @@ from . import User
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 class UserSession(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
@@ -13,6 +14,10 @@ class UserSession(models.Model):
     class Meta:
           verbose_name = _("Session")
           verbose_name_plural = _("Sessions")
+          indexes = [
+               models.Index(fields=['expires_at'], name='session_expires_idx'),
+               models.Index(fields=['user', 'expires_at'], name='session_user_expires_idx'),
+          ]
 
     def clean(self):
           if not self.user:
@@ -20,6 +25,21 @@ class UserSession(models.Model):
           
     def is_valid(self):
          return f"{self.session_token}"
+
+    @classmethod
+    def evict_oldest(cls, user_id, keep):
+         """
+         Delete all but the ``keep`` newest live sessions of a user and
+         return the evicted sessions.
+         """
+         evicted = list(
+              cls.objects.filter(user_id=user_id, expires_at__gt=timezone.now())
+              .order_by('-created_at', '-id')
+              .only('id', 'session_token', 'expires_at')[keep:]
+         )
+         if evicted:
+              cls.objects.filter(id__in=[session.id for session in evicted]).delete()
+         return evicted
     
     def __str__(self):
          return f"{self.created_at} / {self.expires_at}"
\ No newline at end of file
@@ -1,11 +1,14 @@
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser
-from core.utils import image_upload, validate_image
+from core.utils import image_upload, process_image
 from django.core.exceptions import ValidationError
 
 def upload_image(instance, filename):
     return image_upload(instance, filename, 'avatars/')
 
+def upload_raw_image(instance, filename):
+    return image_upload(instance, filename, 'avatars/raw/')
+
 
 class User(AbstractBaseUser):
     firstname = models.CharField(max_length=255)
@@ -30,16 +33,33 @@ class User(AbstractBaseUser):
         return f"{self.firstname} {self.lastname} - {self.email}"
 
 class Avatar(models.Model):
+    STATUS_CHOICES = [
+        ('ready', 'Ready'),
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('failed', 'Failed'),
+    ]
+
     url = models.ImageField(upload_to=upload_image, null=True, blank=True)
+    source = models.FileField(upload_to=upload_raw_image, null=True, blank=True, help_text="Raw upload waiting to be processed")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ready')
+    sizes = models.JSONField(default=dict, blank=True, help_text="Resized copies of url, by longest side in pixels")
+    updated_at = models.DateTimeField(auto_now=True)
     
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="avatar")
 
+    SIZES = (64, 128, 512)
+
     def save(self, *args, **kwargs):
-        if self.url:
+        # Only a newly assigned upload is converted, not the stored WEBP.
+        if self.url and not self.url._committed:
             try:
-                self.url = validate_image(image_field=self.url, max_size_kb=1200, compress_quality=75, path='avatars/')
+                self.url, self.sizes = process_image(
+                    image_field=self.url, sizes=self.SIZES, compress_quality=75, path='avatars/'
+                )
             except (FileNotFoundError, ValueError, ValidationError):
                 self.url = None
+                self.sizes = {}
         super().save(*args, **kwargs)
 
     def __str__(self):
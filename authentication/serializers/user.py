@@ -1,15 +1,20 @@
 from rest_framework import serializers
-from ..models import User, Avatar, Preferences
+from ..models import User, Avatar, Preferences, UserSession
+from ..cache import session_cache
+from ..tokens import revoke_sessions, session_lookup
+from ..avatars import processes_in_background, queue_avatar
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from django.contrib.auth.hashers import check_password
+from django.core.files.storage import default_storage
+from core.utils import inspect_image
 
 class UserChangePasswordSerializer(serializers.Serializer):
     prev_password = serializers.CharField(write_only=True)
     new_password = serializers.CharField(write_only=True)
 
     def validate_prev_password(self, value):
-        user = self.context['request'].user.user
+        user = self.context['request'].user
         if not  check_password(value, user.password):
             raise serializers.ValidationError("Previous password is incorrect.")
         return value
@@ -22,9 +27,17 @@ class UserChangePasswordSerializer(serializers.Serializer):
         return value
 
     def save(self, **kwargs):
-        user = self.context['request'].user.user
+        request = self.context['request']
+        user = request.user
         user.set_password(self.validated_data['new_password'])
         user.save()
+
+        # Every other session of the user is signed out; the current one stays.
+        current_token = request.COOKIES.get('session_token', '')
+        other_sessions = list(UserSession.objects.filter(user=user).exclude(**session_lookup(current_token)))
+        revoke_sessions(other_sessions)
+        UserSession.objects.filter(id__in=[session.id for session in other_sessions]).delete()
+        session_cache.invalidate_user(user, [current_token])
         return user
     
 class UserRegisterSerializer(serializers.Serializer):
@@ -52,6 +65,9 @@ class UserRegisterSerializer(serializers.Serializer):
             firstname=validated_data['firstname'],
             lastname=validated_data['lastname'],
         )
+        # A new user has neither, so serializing the profile needs no queries.
+        User.avatar.related.set_cached_value(user, None)
+        User.preferences.related.set_cached_value(user, None)
         return user
     
 class UserLoginSerializer(serializers.Serializer):
@@ -60,7 +76,7 @@ class UserLoginSerializer(serializers.Serializer):
     
     def validate(self, data):
         try:
-            user = User.objects.get(email=data['email'])
+            user = User.objects.select_related('avatar', 'preferences').get(email=data['email'])
             if user.check_password(data['password']):
                 return user
             else:
@@ -75,11 +91,22 @@ class AvatarUploadSerializer(serializers.ModelSerializer):
         model = Avatar
         fields = ['image']
 
+    def validate_image(self, value):
+        # Rejected from the header alone, before the upload is decoded or stored.
+        try:
+            inspect_image(value)
+        except ValidationError as e:
+            raise serializers.ValidationError(e.messages)
+        return value
+
     def create(self, validated_data):
         user = self.context['request'].user
         image = validated_data.get('image')
 
         avatar, created = Avatar.objects.get_or_create(user=user)
+        if processes_in_background():
+            return queue_avatar(avatar, image)
+
         avatar.url = image
         avatar.save()
         return avatar
@@ -106,9 +133,14 @@ class PreferencesSerializer(serializers.ModelSerializer):
         fields = ['theme_color']
 
 class AvatarSerializer(serializers.ModelSerializer):
+    sizes = serializers.SerializerMethodField()
+
     class Meta:
         model = Avatar
-        fields = ['url']
+        fields = ['url', 'sizes', 'status']
+
+    def get_sizes(self, obj):
+        return {str(size): default_storage.url(name) for size, name in obj.sizes.items()}
 
 class UserProfileSerializer(serializers.ModelSerializer):
     avatar = AvatarSerializer()
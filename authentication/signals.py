@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import User, Avatar, Preferences
+from .cache import invalidate_profile
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_profile(instance.pk))
+
+
+@receiver(post_save, sender=Avatar)
+@receiver(post_delete, sender=Avatar)
+@receiver(post_save, sender=Preferences)
+@receiver(post_delete, sender=Preferences)
+def profile_part_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_profile(instance.user_id))
@@ -0,0 +1,88 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from authentication import tokens
+from authentication.cache import session_cache
+from authentication.models import User, UserSession
+
+
+@override_settings(SESSION_TOKEN_FORMAT='signed')
+class SignedTokenTestCase(TestCase):
+    """
+    Signed session tokens: verified without reading the session table and
+    rejected once revoked, by any process sharing the default cache.
+    """
+
+    password = 'Correct-Horse-42'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            email='signed@example.com', firstname='Signed', lastname='Token', password=cls.password
+        )
+
+    def setUp(self):
+        cache.clear()
+        session_cache.clear()
+        tokens._revoked.clear()
+
+    def login(self):
+        client = APIClient()
+        response = client.post(
+            '/api/v1/user/login/', {'email': self.user.email, 'password': self.password}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        return client, response.cookies['session_token'].value
+
+    def client_with(self, token):
+        client = APIClient()
+        client.cookies['session_token'] = token
+        return client
+
+    def test_login(self):
+        client, token = self.login()
+        self.assertTrue(tokens.is_signed_token(token))
+        self.assertEqual(tokens.read_signed_token(token)[1], UserSession.objects.get(user=self.user).id)
+
+        # The user and, until it is cached, the profile.
+        with self.assertNumQueries(2):
+            response = client.get('/api/v1/user/profile/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['email'], self.user.email)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(client.get('/api/v1/user/profile/').status_code, 200)
+
+    def test_revocation_reaches_other_processes(self):
+        client, token = self.login()
+        self.assertEqual(client.get('/api/v1/user/profile/').status_code, 200)
+        self.assertEqual(client.post('/api/v1/user/logout/').status_code, 200)
+
+        # Another worker: nothing in memory, only the shared deny-list.
+        tokens._revoked.clear()
+        session_cache.clear()
+        self.assertEqual(self.client_with(token).get('/api/v1/user/profile/').status_code, 403)
+
+    def test_tampered_token(self):
+        _, token = self.login()
+        tampered = token[:-1] + ('A' if token[-1] != 'A' else 'B')
+        self.assertEqual(self.client_with(tampered).get('/api/v1/user/profile/').status_code, 403)
+
+    def test_password_change_keeps_current_session(self):
+        client, token = self.login()
+        other_client, other_token = self.login()
+        self.assertEqual(other_client.get('/api/v1/user/profile/').status_code, 200)
+
+        response = client.post(
+            '/api/v1/user/change-password/',
+            {'prev_password': self.password, 'new_password': 'Battery-Staple-43'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.client_with(token).get('/api/v1/user/profile/').status_code, 200)
+        self.assertEqual(self.client_with(other_token).get('/api/v1/user/profile/').status_code, 403)
+        self.assertEqual(
+            list(UserSession.objects.filter(user=self.user).values_list('id', flat=True)),
+            [tokens.read_signed_token(token)[1]],
+        )
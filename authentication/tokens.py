@@ -0,0 +1,97 @@
+import threading
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.utils import timezone
+from .cache import session_cache
+
+SIGNED_TOKEN_SALT = 'authentication.session'
+
+_revoked = {}
+_revoked_lock = threading.Lock()
+
+
+def uses_signed_tokens():
+    return getattr(settings, 'SESSION_TOKEN_FORMAT', 'uuid') == 'signed'
+
+
+def is_signed_token(token):
+    # uuid4 tokens never contain the signer's ':' separator.
+    return ':' in token
+
+
+def issue_session_token(session):
+    """
+    Cookie value for a freshly created UserSession. In 'signed' mode it
+    carries the user id, session id and expiry so authentication can verify
+    it without reading the session table.
+    """
+    if not uses_signed_tokens():
+        return session.session_token
+
+    return signing.dumps(
+        {'u': session.user_id, 's': session.id, 'e': int(session.expires_at.timestamp())},
+        salt=SIGNED_TOKEN_SALT,
+    )
+
+
+def read_signed_token(token):
+    """
+    Return (user_id, session_id, expires_at) of a signed token, raising
+    signing.BadSignature when it was not issued by us.
+    """
+    payload = signing.loads(token, salt=SIGNED_TOKEN_SALT)
+    expires_at = datetime.fromtimestamp(payload['e'], tz=dt_timezone.utc)
+    return payload['u'], payload['s'], expires_at
+
+
+def session_lookup(token):
+    """
+    Filter kwargs matching the UserSession that a cookie token refers to.
+    """
+    if is_signed_token(token):
+        try:
+            return {'id': read_signed_token(token)[1]}
+        except signing.BadSignature:
+            return {'pk__in': []}
+    return {'session_token': token}
+
+
+def is_revoked_locally(session_id):
+    with _revoked_lock:
+        return session_id in _revoked
+
+
+def is_session_revoked(session_id):
+    if is_revoked_locally(session_id):
+        return True
+    return cache.get(f"session_revoked:{session_id}") is not None
+
+
+async def ais_session_revoked(session_id):
+    if is_revoked_locally(session_id):
+        return True
+    return await cache.aget(f"session_revoked:{session_id}") is not None
+
+
+def revoke_sessions(sessions):
+    """
+    Put ``sessions`` (UserSession instances, about to be deleted) on the
+    deny-list until they would have expired anyway, and drop them from the
+    session cache. Signed tokens are only checked against this list.
+    """
+    now = timezone.now()
+    with _revoked_lock:
+        for session_id in [session_id for session_id, expires_at in _revoked.items() if expires_at <= now]:
+            del _revoked[session_id]
+
+    for session in sessions:
+        remaining = int((session.expires_at - now).total_seconds())
+        if remaining <= 0:
+            continue
+        with _revoked_lock:
+            _revoked[session.id] = session.expires_at
+        cache.set(f"session_revoked:{session.id}", True, remaining)
+
+    session_cache.invalidate(*[session.session_token for session in sessions])
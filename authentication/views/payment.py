@@ -11,13 +11,17 @@ from django.utils import timezone
 from django.db import transaction
 import uuid
 from quiz.models.category import Category, UserCategoryAccess
+from core.pagination import KeysetPagination
+from core.db.routers import pin_to_primary
 
 class PaymentListView(generics.ListAPIView):
     serializer_class = PaymentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
-        return Payment.objects.filter(user=self.request.user)
+        return Payment.objects.filter(user=self.request.user).select_related('category')
 
 
 class PaymentDetailView(generics.RetrieveAPIView):
@@ -65,6 +69,7 @@ class PaymentCategoryPurchaseView(APIView):
         )
 
         payment.mark_completed()
+        pin_to_primary(request.user.pk)
         
         return Response({
             'payment_id': payment.id,
@@ -1,7 +1,7 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
 from ..serializers.user import UserLoginSerializer, UserProfileSerializer, UserRegisterSerializer, UserChangePasswordSerializer, AvatarUploadSerializer, AvatarSerializer, PreferencesCreateSerializer, PreferencesSerializer
-from ..models import UserSession, User
+from ..models import UserSession, User, Avatar
 from django.middleware.csrf import get_token
 import uuid
 from rest_framework import status
@@ -9,12 +9,23 @@ from datetime import timedelta
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.utils.timezone import now
 from ..utils import get_client_ip
+from ..cache import session_cache, get_cached_profile, set_cached_profile
+from ..tokens import issue_session_token, revoke_sessions
 from rest_framework.views import APIView
+from django.conf import settings
 
 class AvatarView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = AvatarUploadSerializer
 
+    def get(self, request):
+        # Polled by clients after a background upload until status is 'ready'.
+        avatar = Avatar.objects.filter(user=request.user).first()
+        if avatar is None:
+            return Response({'url': None, 'status': None})
+
+        return Response(AvatarSerializer(avatar).data)
+
     def post(self, request):
         serializer = self.get_serializer(data=request.data, context={'request': request})
         if serializer.is_valid():
@@ -22,6 +33,8 @@ class AvatarView(generics.GenericAPIView):
 
             avatar_data = AvatarSerializer(avatar).data
 
+            if avatar.status == 'pending':
+                return Response(avatar_data, status=status.HTTP_202_ACCEPTED)
             return Response(avatar_data, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -67,7 +80,7 @@ class UserRegisterView(generics.GenericAPIView):
         response = Response(user_data, status=status.HTTP_201_CREATED)
         response.set_cookie(
             'session_token',
-            session.session_token,
+            issue_session_token(session),
             expires=expires_at,
             httponly=False,
             secure=False, 
@@ -102,13 +115,17 @@ class UserLoginView(generics.GenericAPIView):
             ip=get_client_ip(request),
             expires_at=expires_at,
         )
+
+        max_sessions = getattr(settings, 'MAX_SESSIONS_PER_USER', None)
+        if max_sessions:
+            revoke_sessions(UserSession.evict_oldest(user.id, max_sessions))
         
         user_data = UserProfileSerializer(user).data
         
         response = Response(user_data, status=status.HTTP_201_CREATED)
         response.set_cookie(
             'session_token',
-            session.session_token,
+            issue_session_token(session),
             expires=expires_at,
             httponly=False,
             secure=False, 
@@ -126,6 +143,8 @@ class UserLogoutView(generics.GenericAPIView):
         sessions = UserSession.objects.filter(user_id=user)
         response = Response({'details': 'Logged out successfully'}, status=status.HTTP_200_OK)
         if sessions:
+            revoke_sessions(sessions)
+            session_cache.invalidate_user(user)
             sessions.delete()
             response.set_cookie(
                 'session_token',  
@@ -149,9 +168,15 @@ class UserProfileView(generics.RetrieveAPIView):
     def get(self, request, *args, **kwargs):
         user = request.user
 
-        serializer = UserProfileSerializer(user)
+        data = get_cached_profile(user.pk)
+        if data is None:
+            # Loaded fresh rather than from the (possibly cached) request user,
+            # so the payload stored for every worker is current.
+            user = User.objects.select_related('avatar', 'preferences').get(pk=user.pk)
+            data = UserProfileSerializer(user).data
+            set_cached_profile(user.pk, data)
 
-        return Response(serializer.data)
+        return Response(data)
 
 class UserChangePassword(APIView):
     permission_classes = [IsAuthenticated]
@@ -0,0 +1,75 @@
+import json
+from django.http import Http404, HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from core.db.routers import has_replica, ais_pinned_to_primary, replica_reads
+
+
+class AsyncAPIView(View):
+    """
+    A minimal async counterpart of an authenticated DRF APIView, for serving
+    hot endpoints natively under ASGI. Handlers are ``async def`` methods
+    returning ``self.render(data)``.
+
+    The user is resolved with the ``aauthenticate`` method of the configured
+    DRF authentication classes, and responses are rendered with DRF's JSON
+    renderer so the payloads match the sync views byte for byte.
+    With ``use_replica`` set, reads go to the replica as in ReplicaReadMixin.
+    """
+
+    use_replica = False
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Like APIView, authentication is by session cookie, not CSRF token.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        token = None
+        try:
+            request.user = await self.authenticate(request)
+
+            if self.use_replica and has_replica() and not await ais_pinned_to_primary(request.user.pk):
+                token = replica_reads.set(True)
+
+            return await super().dispatch(request, *args, **kwargs)
+        except (NotAuthenticated, AuthenticationFailed) as exc:
+            # As in APIView when no authenticator sends a WWW-Authenticate header.
+            return self.render({'detail': exc.detail}, status=status.HTTP_403_FORBIDDEN)
+        except APIException as exc:
+            return self.render({'detail': exc.detail}, status=exc.status_code)
+        except Http404 as exc:
+            return self.render({'detail': str(exc) or 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        finally:
+            if token is not None:
+                replica_reads.reset(token)
+
+    async def authenticate(self, request):
+        for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+            authenticator = authentication_class()
+            if not hasattr(authenticator, 'aauthenticate'):
+                continue
+            result = await authenticator.aauthenticate(request)
+            if result is not None:
+                return result[0]
+        raise NotAuthenticated()
+
+    def get_data(self, request):
+        """
+        The request body, parsed as DRF's default parsers would: a QueryDict
+        for form and multipart bodies, JSON otherwise. Uploaded files are
+        not included.
+        """
+        if request.content_type in ('application/x-www-form-urlencoded', 'multipart/form-data'):
+            return request.POST
+        try:
+            return json.loads(request.body or b'{}')
+        except ValueError as exc:
+            raise ParseError(f'JSON parse error - {exc}') from exc
+
+    def render(self, data, status=status.HTTP_200_OK):
+        return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
@@ -0,0 +1,14 @@
+from django.conf import settings
+
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def has_shared_cache():
+    """
+    Whether the default cache is seen by every worker process, so that a
+    write or delete in one of them takes effect in all.
+    """
+    return settings.CACHES.get('default', {}).get('BACKEND') not in LOCAL_CACHE_BACKENDS
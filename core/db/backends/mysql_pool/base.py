@@ -0,0 +1,73 @@
+import threading
+from django.db import OperationalError
+from django.db.backends.mysql import base
+from core.db.pool import ConnectionPool, PoolTimeout
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    The mysqlclient backend, with connections borrowed from a process-wide
+    pool instead of opened and closed for every request.
+
+    Pool options come from the ``POOL`` key of the database settings:
+    MAX_SIZE, MAX_IDLE, PING_AFTER and TIMEOUT (see ConnectionPool).
+    Use it with CONN_MAX_AGE = 0, so the connection goes back to the pool
+    when the request finishes.
+    """
+
+    pool = None
+    reused_connection = False
+
+    def get_pool(self, conn_params):
+        key = (
+            self.alias,
+            conn_params.get('host'), conn_params.get('port'), conn_params.get('unix_socket'),
+            conn_params.get('database'), conn_params.get('user'),
+        )
+        with _pools_lock:
+            if key not in _pools:
+                options = self.settings_dict.get('POOL', {})
+                _pools[key] = ConnectionPool(
+                    lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+                    max_size=options.get('MAX_SIZE', 10),
+                    max_idle=options.get('MAX_IDLE', 300),
+                    ping_after=options.get('PING_AFTER', 5),
+                    timeout=options.get('TIMEOUT', 10),
+                )
+            return _pools[key]
+
+    def get_new_connection(self, conn_params):
+        self.pool = self.get_pool(conn_params)
+        try:
+            connection, self.reused_connection = self.pool.acquire()
+        except PoolTimeout as e:
+            raise OperationalError(str(e)) from e
+        return connection
+
+    def init_connection_state(self):
+        # A reused connection already has its session variables set.
+        if not self.reused_connection:
+            super().init_connection_state()
+
+    def _close(self):
+        if self.connection is None:
+            return
+
+        if self.in_atomic_block or self.errors_occurred or not self.is_usable():
+            # Closed mid-transaction, or after a database error: the
+            # connection may be broken or in an unknown state.
+            self.pool.discard(self.connection)
+            return
+
+        try:
+            with self.wrap_database_errors:
+                if not self.connection.get_autocommit():
+                    self.connection.rollback()
+                    self.connection.autocommit(True)
+        except Exception:
+            self.pool.discard(self.connection)
+            raise
+        self.pool.release(self.connection)
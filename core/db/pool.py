@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of DB-API connections.
+
+    Idle connections are reused newest first; those idle for longer than
+    ``max_idle`` seconds are closed. A connection idle for more than
+    ``ping_after`` seconds is pinged before it is handed out, and replaced
+    if the ping fails. At most ``max_size`` connections are open at once;
+    ``acquire`` waits up to ``timeout`` seconds for one to be released.
+    """
+
+    def __init__(self, connect, max_size=10, max_idle=300, ping_after=5, timeout=10):
+        self.connect = connect
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.ping_after = ping_after
+        self.timeout = timeout
+
+        self._idle = deque()
+        self._size = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        with self._condition:
+            while True:
+                self._evict_idle()
+                if self._idle:
+                    connection, released_at = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    connection = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(f"No database connection free after {self.timeout} seconds.")
+                self._condition.wait(remaining)
+
+        if connection is not None:
+            if time.monotonic() - released_at < self.ping_after or self._is_usable(connection):
+                return connection, True
+            # The replacement takes over the stale connection's slot, so the
+            # slot is never free for another thread in between.
+            self._close(connection)
+
+        try:
+            return self.connect(), False
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, connection):
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def discard(self, connection):
+        self._discard(connection)
+
+    def close_all(self):
+        with self._condition:
+            idle, self._idle = self._idle, deque()
+        for connection, released_at in idle:
+            self._discard(connection)
+
+    def _evict_idle(self):
+        # Oldest connections sit at the left end; called with the lock held.
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][1] > self.max_idle:
+            connection, released_at = self._idle.popleft()
+            self._size -= 1
+            self._close(connection)
+
+    def _discard(self, connection):
+        self._close(connection)
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_usable(connection):
+        try:
+            connection.ping()
+        except Exception:
+            return False
+        return True
@@ -0,0 +1,73 @@
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+
+REPLICA = 'replica'
+
+# Set for the duration of a request served by a ReplicaReadMixin view.
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+def has_replica():
+    return REPLICA in settings.DATABASES
+
+
+def pin_to_primary(user_id):
+    """
+    Send the user's reads to the primary for REPLICA_PIN_SECONDS after a
+    write, so they see it before the replica has caught up. The pin lives in
+    the default cache, which must be shared between workers for it to hold
+    across processes.
+    """
+    if has_replica():
+        cache.set(f"db_pinned:{user_id}", True, getattr(settings, 'REPLICA_PIN_SECONDS', 10))
+
+
+def is_pinned_to_primary(user_id):
+    return cache.get(f"db_pinned:{user_id}") is not None
+
+
+async def ais_pinned_to_primary(user_id):
+    return await cache.aget(f"db_pinned:{user_id}") is not None
+
+
+class ReplicaRouter:
+    """
+    Reads go to the replica only inside views that opted in with
+    ReplicaReadMixin; everything else, and every write, uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if replica_reads.get() and has_replica():
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives the schema through replication.
+        return db != REPLICA
+
+
+class ReplicaReadMixin:
+    """
+    For read-only APIViews: once the user is authenticated (the session
+    lookup stays on the primary), the rest of the request reads from the
+    replica unless the user wrote something moments ago.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if has_replica() and not is_pinned_to_primary(request.user.pk):
+            self._replica_token = replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            replica_reads.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,122 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a sort key plus a unique tiebreaker.
+
+    The ordering comes from the view's ``keyset_ordering`` (for example
+    ``('-created_at', '-id')``) and should be backed by a composite index so
+    each page is an index range scan, however deep the client scrolls.
+    Cursors are opaque base64 tokens holding the last row's key values.
+
+    Pagination is opt-in: without a ``cursor`` or ``page_size`` query
+    parameter the full list is returned, as before.
+    """
+
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        paginate_queryset for async views; ``request`` is a plain HttpRequest.
+        """
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        # Works for both DRF and plain Django requests.
+        params = getattr(request, 'query_params', request.GET)
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.ordering = getattr(view, 'keyset_ordering', self.ordering)
+        self.page_size = self.get_page_size(params)
+
+        queryset = queryset.order_by(*self.ordering)
+        cursor = params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.get_cursor_filter(queryset.model, cursor))
+
+        # One extra row tells whether there is a next page.
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.last_row = rows[-1] if rows else None
+        return rows
+
+    def get_page_size(self, params):
+        try:
+            page_size = int(params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_cursor_filter(self, model, cursor):
+        key, tiebreaker = [field.lstrip('-') for field in self.ordering]
+        key_lookup, tiebreaker_lookup = [
+            f"{field.lstrip('-')}__{'lt' if field.startswith('-') else 'gt'}" for field in self.ordering
+        ]
+
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode()).decode())
+            key_value = model._meta.get_field(key).to_python(values[0])
+            tiebreaker_value = model._meta.get_field(tiebreaker).to_python(values[1])
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+        return Q(**{key_lookup: key_value}) | Q(**{key: key_value, tiebreaker_lookup: tiebreaker_value})
+
+    def encode_cursor(self, row):
+        values = []
+        for field in self.ordering:
+            value = getattr(row, field.lstrip('-'))
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.last_row))
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'results': data,
+        }
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -99,6 +99,10 @@ AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',
 ]
 
+# Serve the quiz list, questions, answer and statistics endpoints with their
+# async views (quiz.views.quiz_async). Only worthwhile under ASGI (core.asgi).
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'authentication.middleware.CustomSessionAuthentication',
@@ -106,6 +110,78 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Resolved session tokens are kept in a per-process LRU for TTL seconds. A
+# logout or password change only clears the worker that handled it, so the
+# other workers keep accepting the old session for up to TTL seconds. With
+# SHARED enabled (and a shared default cache below) the tokens are stored in
+# that cache only, invalidation is immediate everywhere and TTL can be longer.
+SESSION_CACHE_SHARED = os.getenv('SESSION_CACHE_SHARED', 'False') == 'True'
+SESSION_AUTH_CACHE = {
+    'ENABLED': os.getenv('SESSION_CACHE_ENABLED', 'True') == 'True',
+    'MAX_SIZE': int(os.getenv('SESSION_CACHE_MAX_SIZE', '10000')),
+    'TTL': int(os.getenv('SESSION_CACHE_TTL', '60' if SESSION_CACHE_SHARED else '5')),
+    'SHARED': SESSION_CACHE_SHARED,
+    'PROFILE_TTL': int(os.getenv('PROFILE_CACHE_TTL', '3600')),
+}
+
+# 'uuid' cookies are looked up in the session table; 'signed' cookies carry
+# a signed (user, session, expiry) payload verified in memory. Both formats
+# are accepted regardless of this setting, which only picks what login issues.
+# Logouts are enforced for signed cookies only through a revocation list in
+# the default cache, so 'signed' needs a cache shared by every worker
+# (Redis/Memcached); the authentication.E001 check refuses LocMem/Dummy.
+SESSION_TOKEN_FORMAT = os.getenv('SESSION_TOKEN_FORMAT', 'uuid')
+
+# Oldest live sessions beyond this count are evicted on login and by
+# the reap_sessions command. Unset means no cap.
+MAX_SESSIONS_PER_USER = int(os.getenv('MAX_SESSIONS_PER_USER', '0')) or None
+
+# 'rollup' reads the per-user statistics tables (see rebuild_statistics),
+# 'answers' aggregates the user's answers on every request.
+STATISTICS_SOURCE = os.getenv('STATISTICS_SOURCE', 'rollup')
+# Cached statistics are versioned per user. As with the quiz content below,
+# without a shared cache a worker only notices answers recorded by another
+# worker once its version expires after STATISTICS_VERSION_TTL seconds.
+STATISTICS_CACHE_TIMEOUT = int(os.getenv('STATISTICS_CACHE_TIMEOUT', str(60 * 60 * 24)))
+STATISTICS_VERSION_TTL = int(os.getenv('STATISTICS_VERSION_TTL', '60'))
+
+# Serialized questions of a quiz, versioned and replaced on any quiz,
+# question or topic change. Version bumps only reach other workers through a
+# shared cache; with the default LocMem cache each worker drops its version
+# after QUIZ_CONTENT_VERSION_TTL seconds instead, so an edit made elsewhere
+# can be served stale for up to that long.
+QUIZ_CONTENT_CACHE_TIMEOUT = int(os.getenv('QUIZ_CONTENT_CACHE_TIMEOUT', str(60 * 60 * 24)))
+QUIZ_CONTENT_VERSION_TTL = int(os.getenv('QUIZ_CONTENT_VERSION_TTL', '60'))
+
+# Per-user category access maps: LOCAL_TTL seconds in process, TTL seconds
+# in the default cache, never past the earliest access expiry.
+ENTITLEMENT_CACHE = {
+    'LOCAL_TTL': int(os.getenv('ENTITLEMENT_CACHE_LOCAL_TTL', '10')),
+    'TTL': int(os.getenv('ENTITLEMENT_CACHE_TTL', '300')),
+    'MAX_SIZE': int(os.getenv('ENTITLEMENT_CACHE_MAX_SIZE', '10000')),
+}
+
+# 'sync' converts avatar uploads inside the request. 'background' stores the
+# raw upload and encodes it in a pool of POOL_SIZE threads; with POOL_SIZE 0
+# pending avatars are left to the process_avatars command.
+AVATAR_PROCESSING = {
+    'MODE': os.getenv('AVATAR_PROCESSING_MODE', 'sync'),
+    'POOL_SIZE': int(os.getenv('AVATAR_PROCESSING_POOL_SIZE', '2')),
+}
+
+# Uploaded images whose decoded bitmap would exceed this many pixels are
+# rejected from their header, before any decoding. IMAGE_MAX_UPLOAD_KB caps
+# the raw upload; it is generous so phone photos are accepted and compressed.
+IMAGE_MAX_PIXELS = int(os.getenv('IMAGE_MAX_PIXELS', str(25 * 1000 * 1000)))
+IMAGE_MAX_UPLOAD_KB = int(os.getenv('IMAGE_MAX_UPLOAD_KB', str(10 * 1024)))
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
 
 ROOT_URLCONF = 'core.urls'
 
@@ -133,9 +209,18 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DB_POOL=True borrows connections from a per-process pool (see
+# core.db.backends.mysql_pool) and returns them after every request.
+# Otherwise each thread may keep its own connection for DB_CONN_MAX_AGE
+# seconds (0, closing it after every request, by default). Under ASGI
+# (ASYNC_VIEWS) every sync_to_async thread would hold one, so persistent
+# connections are always off there; use DB_POOL instead.
+DB_POOL = os.getenv('DB_POOL', 'False') == 'True'
+DB_CONN_MAX_AGE = 0 if DB_POOL or ASYNC_VIEWS else int(os.getenv('DB_CONN_MAX_AGE', '0'))
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': 'core.db.backends.mysql_pool' if DB_POOL else 'django.db.backends.mysql',
         'NAME': os.getenv('DB_NAME', 'sazrisi_db'),
         'USER': os.getenv('DB_USER', 'root'),
         'PASSWORD': os.getenv('DB_PASSWORD', 'root'),
@@ -143,10 +228,35 @@ DATABASES = {
         'PORT': os.getenv('DB_PORT', '3306'),
         'OPTIONS': {
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
-        }
+        },
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'POOL': {
+            'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'MAX_IDLE': int(os.getenv('DB_POOL_MAX_IDLE', '300')),
+            'PING_AFTER': int(os.getenv('DB_POOL_PING_AFTER', '5')),
+            'TIMEOUT': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+        },
     }
 }
 
+# With DB_REPLICA_HOST set, the read-only statistics and listing views read
+# from this replica (see core.db.routers). A user's reads stay on the
+# primary for REPLICA_PIN_SECONDS after they answer a question or pay.
+if os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.db.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '10'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
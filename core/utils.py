@@ -1,38 +1,151 @@
 import os
 import uuid
-from PIL import Image
-from io import BytesIO
+import hashlib
+import logging
+from PIL import Image, UnidentifiedImageError
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.core.files.storage import default_storage
 from django.conf import settings
 from django.core.files import File
 
+logger = logging.getLogger(__name__)
+
+ALLOWED_IMAGE_FORMATS = ['JPEG', 'PNG', 'WEBP', 'GIF', 'BMP']
+
 def image_upload(instance, filename, dir):
     ext = filename.split('.')[-1]
     filename = f'{uuid.uuid4()}.{ext}'
     return os.path.join(dir, filename)
 
-def validate_image(image_field, max_size_kb=1200, compress_quality=75, path=''):
+def content_hash(image_field, chunk_size=64 * 1024):
+    image_field.seek(0)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: image_field.read(chunk_size), b''):
+        digest.update(chunk)
+    image_field.seek(0)
+    return digest.hexdigest()[:32]
+
+def file_size(image_field):
+    size = getattr(image_field, 'size', None)
+    if size is None:
+        position = image_field.tell()
+        image_field.seek(0, os.SEEK_END)
+        size = image_field.tell()
+        image_field.seek(position)
+    return size
+
+def inspect_image(image_field, max_upload_kb=None, max_pixels=None):
+    """
+    Open an upload reading only its header, and reject it before anything
+    is decoded when the file, or the bitmap it would decode to, is too big.
+    """
+    if max_upload_kb is None:
+        max_upload_kb = getattr(settings, 'IMAGE_MAX_UPLOAD_KB', 10 * 1024)
+    if max_pixels is None:
+        max_pixels = getattr(settings, 'IMAGE_MAX_PIXELS', 25 * 1000 * 1000)
+
+    if max_upload_kb and file_size(image_field) > max_upload_kb * 1024:
+        raise ValidationError(f"Image is larger than {max_upload_kb} KB.")
+
+    image_field.seek(0)
+    try:
+        img = Image.open(image_field, formats=ALLOWED_IMAGE_FORMATS)
+    except UnidentifiedImageError:
+        raise ValidationError(f"Unsupported image format. Allowed: {', '.join(ALLOWED_IMAGE_FORMATS)}.")
+    except Image.DecompressionBombError:
+        raise ValidationError("Image is too large.")
+    except OSError as e:
+        raise ValidationError(f"Invalid image: {e}")
+    if img.width * img.height > max_pixels:
+        raise ValidationError(f"Image is too large ({img.width}x{img.height}).")
+    return img
+
+def touch(name):
+    """
+    Give a stored file a fresh modification time, so the grace period of
+    the collect_media command protects it again. A no-op on storages
+    without local paths.
+    """
+    try:
+        os.utime(default_storage.path(name))
+    except NotImplementedError:
+        pass
+
+def save_webp(img, name, compress_quality):
+    """
+    Encode ``img`` as WEBP under the storage name ``name``. Local files are
+    written under a temporary name and renamed into place, so ``name`` never
+    holds a partial image that the content-hash dedupe would then reuse.
+    """
     try:
-        img = Image.open(image_field)
+        file_path = default_storage.path(name)
+    except NotImplementedError:
+        # Remote storages only publish an object once its upload completes.
+        with default_storage.open(name, 'wb') as f:
+            img.save(f, format='WEBP', quality=compress_quality, optimize=True)
+        return
+
+    partial_path = f"{file_path}.{uuid.uuid4().hex}.part"
+    logger.debug("Saving image at: %s", file_path)
+    try:
+        with open(partial_path, 'wb') as f:
+            img.save(f, format='WEBP', quality=compress_quality, optimize=True)
+        os.replace(partial_path, file_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+def process_image(image_field, sizes=(), max_upload_kb=None, compress_quality=75, path=''):
+    """
+    Encode an upload as a full-size WEBP plus one WEBP per entry of ``sizes``
+    (longest side in pixels), all from a single decode. Files are named after
+    the upload's content hash, so re-uploading the same picture reuses them.
+    Returns (name, {size: name}).
+
+    Only the header is read before the upload is checked against
+    ``max_upload_kb`` (IMAGE_MAX_UPLOAD_KB by default) and IMAGE_MAX_PIXELS,
+    and each WEBP is encoded straight into its storage file.
+    """
+    try:
+        img = inspect_image(image_field, max_upload_kb=max_upload_kb)
+
+        digest = content_hash(image_field)
+        name = f"{path}{digest}.webp"
+        names = {size: f"{path}{digest}_{size}.webp" for size in sizes}
+        files = [name, *names.values()]
+        if all(default_storage.exists(existing) for existing in files):
+            # The files may be old and unreferenced, i.e. about to be
+            # collected; touching them puts them back in the grace period.
+            for existing in files:
+                touch(existing)
+            return name, names
+
+        if img.width > 4000 or img.height > 4000:
+            # JPEGs are decoded directly at a reduced scale.
+            img.draft('RGB', (int(img.width / 2), int(img.height / 2)))
         img = img.convert('RGB')
 
         if img.width > 4000 or img.height > 4000:
             img.thumbnail((int(img.width / 2), int(img.height / 2)))
 
-        buffer = BytesIO()
-        img.save(buffer, format='WEBP', quality=compress_quality, optimize=True)
-        buffer.seek(0)
-
-        webp_filename = f"{uuid.uuid4()}.webp"
-        file_path = os.path.join(settings.MEDIA_ROOT, path, webp_filename)
+        save_webp(img, name, compress_quality)
 
-        print(f"Saving image at: {file_path}")
-        with default_storage.open(file_path, 'wb') as f:
-            f.write(buffer.read())
+        # Each size is reduced from the previous, larger one.
+        variant = img
+        for size in sorted(sizes, reverse=True):
+            variant = variant.copy()
+            variant.thumbnail((size, size), reducing_gap=2.0)
+            save_webp(variant, names[size], compress_quality)
 
-        return f"{path}{webp_filename}"
+        return name, names
 
+    except ValidationError:
+        raise
     except Exception as e:
-        raise ValidationError(f"Image compression failed: {str(e)}")
\ No newline at end of file
+        raise ValidationError(f"Image compression failed: {str(e)}")
+
+def validate_image(image_field, max_size_kb=1200, compress_quality=75, path=''):
+    name, names = process_image(image_field, compress_quality=compress_quality, path=path)
+    return name
@@ -18,6 +18,11 @@ class QuestionInline(admin.StackedInline):
 @admin.register(Quiz)
 class QuizAdmin(admin.ModelAdmin):
     inlines = [QuestionInline]
+    readonly_fields = ['question_count', 'total_score']
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        form.instance.refresh_aggregates()
 
 
 class QuestionAdminForm(forms.ModelForm):
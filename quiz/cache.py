@@ -0,0 +1,168 @@
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from core.cache import has_shared_cache
+
+
+def statistics_timeout():
+    return getattr(settings, 'STATISTICS_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def statistics_version_timeout():
+    """
+    Lifetime of a statistics version: kept until replaced in a shared cache,
+    STATISTICS_VERSION_TTL seconds in a per-process one, whose workers never
+    see each other's bumps.
+    """
+    if has_shared_cache():
+        return None
+    return getattr(settings, 'STATISTICS_VERSION_TTL', 60)
+
+
+def get_statistics_version(user_id):
+    """
+    Opaque token identifying the current state of a user's statistics. It is
+    replaced whenever the user's answers change and doubles as the ETag.
+    """
+    key = f"statistics_version:{user_id}"
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, statistics_version_timeout()):
+            version = cache.get(key) or version
+    return version
+
+
+async def aget_statistics_version(user_id):
+    key = f"statistics_version:{user_id}"
+    version = await cache.aget(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not await cache.aadd(key, version, statistics_version_timeout()):
+            version = await cache.aget(key) or version
+    return version
+
+
+def bump_statistics_version(user_id):
+    cache.set(f"statistics_version:{user_id}", uuid.uuid4().hex, statistics_version_timeout())
+
+
+def get_cached_statistics(user_id, version):
+    return cache.get(f"statistics:{user_id}:{version}")
+
+
+def set_cached_statistics(user_id, version, data):
+    cache.set(f"statistics:{user_id}:{version}", data, statistics_timeout())
+
+
+async def aget_cached_statistics(user_id, version):
+    return await cache.aget(f"statistics:{user_id}:{version}")
+
+
+async def aset_cached_statistics(user_id, version, data):
+    await cache.aset(f"statistics:{user_id}:{version}", data, statistics_timeout())
+
+
+def quiz_content_timeout():
+    return getattr(settings, 'QUIZ_CONTENT_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def quiz_content_version_timeout():
+    """
+    Lifetime of a quiz content version. A shared cache sees every bump, so
+    the version is kept until replaced. A per-process cache never sees the
+    bumps made by other workers, so its version expires after
+    QUIZ_CONTENT_VERSION_TTL seconds and the content is rebuilt.
+    """
+    if has_shared_cache():
+        return None
+    return getattr(settings, 'QUIZ_CONTENT_VERSION_TTL', 60)
+
+
+def get_quiz_content_version(quiz_id):
+    """
+    Opaque token identifying the current content of a quiz (its questions
+    and their topics), replaced whenever a Quiz, Question or Topic changes.
+    """
+    key = f"quiz_content_version:{quiz_id}"
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, quiz_content_version_timeout()):
+            version = cache.get(key) or version
+    return version
+
+
+def bump_quiz_content_version(*quiz_ids):
+    cache.set_many(
+        {f"quiz_content_version:{quiz_id}": uuid.uuid4().hex for quiz_id in quiz_ids},
+        quiz_content_version_timeout(),
+    )
+
+
+def get_cached_quiz_content(quiz_id, version):
+    return cache.get(f"quiz_content:{quiz_id}:{version}")
+
+
+def set_cached_quiz_content(quiz_id, version, content):
+    cache.set(f"quiz_content:{quiz_id}:{version}", content, quiz_content_timeout())
+
+
+def get_entitlement_setting(name, default):
+    return getattr(settings, 'ENTITLEMENT_CACHE', {}).get(name, default)
+
+
+_entitlements = OrderedDict()
+_entitlements_lock = threading.Lock()
+
+
+def get_entitlements(user_id, load):
+    """
+    Category access map of a user ({category_id: expires_at}), served from a
+    short-lived in-process LRU, then the shared cache, then ``load()``.
+
+    Entries never outlive the earliest expiry in the map. Writes to
+    UserCategoryAccess call invalidate_entitlements; other workers may keep
+    their in-process copy for up to LOCAL_TTL seconds.
+    """
+    now = time.monotonic()
+    with _entitlements_lock:
+        entry = _entitlements.get(user_id)
+        if entry is not None:
+            if entry[1] > now:
+                _entitlements.move_to_end(user_id)
+                return entry[0]
+            del _entitlements[user_id]
+
+    key = f"entitlements:{user_id}"
+    access_map = cache.get(key)
+    if access_map is None:
+        access_map = load()
+        timeout = get_entitlement_setting('TTL', 300)
+        if access_map:
+            until_expiry = (min(access_map.values()) - timezone.now()).total_seconds()
+            timeout = max(0, min(timeout, int(until_expiry)))
+        if timeout:
+            cache.set(key, access_map, timeout)
+
+    local_ttl = get_entitlement_setting('LOCAL_TTL', 10)
+    if access_map:
+        until_expiry = (min(access_map.values()) - timezone.now()).total_seconds()
+        local_ttl = min(local_ttl, until_expiry)
+
+    with _entitlements_lock:
+        _entitlements[user_id] = (access_map, now + local_ttl)
+        while len(_entitlements) > get_entitlement_setting('MAX_SIZE', 10000):
+            _entitlements.popitem(last=False)
+
+    return access_map
+
+
+def invalidate_entitlements(user_id):
+    with _entitlements_lock:
+        _entitlements.pop(user_id, None)
+    cache.delete(f"entitlements:{user_id}")
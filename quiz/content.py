@@ -0,0 +1,40 @@
+from .cache import get_quiz_content_version, get_cached_quiz_content, set_cached_quiz_content
+from .models.quiz import Question
+from .serializers.quiz import QuestionSerializer, QuestionWithCorrectSerializer, UserAnswerSerializer
+
+
+def build_quiz_content(quiz_id):
+    """
+    The questions of a quiz in order, serialized with their answer, topic and
+    explanation but without any user's answer.
+    """
+    questions = Question.objects.filter(quiz_id=quiz_id).select_related('topic')
+    serializer = QuestionWithCorrectSerializer(questions, many=True, context={'user_answers': {}})
+    return [dict(item) for item in serializer.data]
+
+
+def get_quiz_content(quiz_id):
+    # The version is read before the questions, so content built from rows
+    # that change meanwhile is stored under a version that is already stale.
+    version = get_quiz_content_version(quiz_id)
+    content = get_cached_quiz_content(quiz_id, version)
+    if content is None:
+        content = build_quiz_content(quiz_id)
+        set_cached_quiz_content(quiz_id, version, content)
+    return content
+
+
+def merge_answer_state(content, user_answers):
+    """
+    Per-attempt view of the quiz content: answered questions come with the
+    correct answer, explanation and the user's answer, the others with only
+    their public fields. ``user_answers`` maps question ids to UserAnswers.
+    """
+    merged = []
+    for question in content:
+        user_answer = user_answers.get(question['id'])
+        if user_answer is None:
+            merged.append({field: question[field] for field in QuestionSerializer.Meta.fields})
+        else:
+            merged.append({**question, 'user_answer': UserAnswerSerializer(user_answer).data})
+    return merged
@@ -0,0 +1,103 @@
+import json
+import re
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from authentication.models import User, UserSession, Payment
+from quiz.models.category import UserCategoryAccess
+from quiz.models.quiz import Quiz, QuizAttempt, Question, UserAnswer
+from quiz.models.statistic import UserCategoryStatistic, UserTopicStatistic
+
+
+def hot_queries(user, session, quiz, attempt, question):
+    """
+    The filters used by the request paths, keyed by a short description.
+    """
+    now = timezone.now()
+    return {
+        'session by token': UserSession.objects.select_related('user').filter(session_token=session.session_token),
+        'expired sessions': UserSession.objects.filter(expires_at__lte=now),
+        'category access map': UserCategoryAccess.objects.filter(user=user, is_active=True, expires_at__gt=now),
+        'category access check': UserCategoryAccess.objects.filter(
+            user=user, category_id=quiz.category_id, is_active=True, expires_at__gt=now
+        ),
+        'existing attempt': QuizAttempt.objects.filter(
+            user=user, quiz=quiz, status__in=['started', 'in_progress', 'completed']
+        ),
+        'attempt history': QuizAttempt.objects.filter(user=user).order_by('-started_at', '-id'),
+        'overdue attempts': QuizAttempt.objects.filter(status__in=['started', 'in_progress'], deadline__lte=now),
+        'quiz listing': Quiz.objects.filter(category_id=quiz.category_id).order_by('-created_at', '-id'),
+        'payment listing': Payment.objects.filter(user=user).order_by('-created_at', '-id'),
+        'attempt questions': Question.objects.filter(quiz_id=attempt.quiz_id),
+        'attempt answers': UserAnswer.objects.filter(attempt=attempt),
+        'answer by question': UserAnswer.objects.filter(attempt=attempt, question=question),
+        'user errors': UserAnswer.objects.filter(attempt__user=user, is_correct=False),
+        'category statistics': UserCategoryStatistic.objects.filter(user=user),
+        'topic statistics': UserTopicStatistic.objects.filter(user=user),
+    }
+
+
+def full_scans(queryset):
+    """
+    Tables the database plans to read in full for ``queryset``.
+    """
+    if connection.vendor == 'mysql':
+        plan = json.loads(queryset.explain(format='json'))
+        tables = []
+
+        def walk(node):
+            if isinstance(node, dict):
+                if node.get('access_type') == 'ALL':
+                    tables.append(node.get('table_name'))
+                for value in node.values():
+                    walk(value)
+            elif isinstance(node, list):
+                for value in node:
+                    walk(value)
+
+        walk(plan)
+        return tables
+
+    plan = queryset.explain()
+    if connection.vendor == 'postgresql':
+        return re.findall(r'Seq Scan on (\w+)', plan)
+    return [
+        match.group(1) for match in re.finditer(r'SCAN (\w+)(.*)', plan)
+        if 'INDEX' not in match.group(2)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN for the hot queries of the API and fail if any of them "
+        "falls back to a full table scan. Run it against a seeded database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help="Print every plan.")
+
+    def handle(self, *args, **options):
+        user_answer = UserAnswer.objects.select_related('attempt', 'question').order_by('-pk').first()
+        if user_answer is None:
+            raise CommandError("The database needs at least one answered quiz to explain the hot queries.")
+        attempt = user_answer.attempt
+
+        user = User.objects.get(pk=attempt.user_id)
+        session = UserSession.objects.filter(user=user).first() or UserSession(session_token='')
+        quiz = Quiz.objects.get(pk=attempt.quiz_id)
+
+        failures = []
+        for name, queryset in hot_queries(user, session, quiz, attempt, user_answer.question).items():
+            scanned = full_scans(queryset)
+            if options['verbose_plans']:
+                self.stdout.write(f"== {name}\n{queryset.explain()}\n")
+            if scanned:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"{name}: full scan of {', '.join(scanned)}"))
+            else:
+                self.stdout.write(f"{name}: ok")
+
+        if failures:
+            raise CommandError(f"{len(failures)} hot queries fall back to a full table scan.")
+
+        self.stdout.write(self.style.SUCCESS("All hot queries use an index."))
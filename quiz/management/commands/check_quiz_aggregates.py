@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from quiz.models.quiz import Quiz, question_aggregates
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the stored Quiz.question_count and Quiz.total_score with the "
+        "questions table. Read-only unless --fix is given; exits with an error "
+        "when mismatches are found."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help="Rebuild the quizzes that are out of sync.")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        expected = {f'expected_{name}': expression for name, expression in question_aggregates().items()}
+        batch_size = options['batch_size']
+
+        mismatched = []
+        last_id = 0
+        while True:
+            batch = list(
+                Quiz.objects.filter(pk__gt=last_id).order_by('pk').annotate(**expected).values(
+                    'pk', 'question_count', 'total_score', 'expected_question_count', 'expected_total_score'
+                )[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1]['pk']
+
+            for row in batch:
+                if (row['question_count'], row['total_score']) != (row['expected_question_count'], row['expected_total_score']):
+                    mismatched.append(row['pk'])
+                    self.stdout.write(
+                        f"Quiz {row['pk']}: question_count {row['question_count']} (expected {row['expected_question_count']}), "
+                        f"total_score {row['total_score']} (expected {row['expected_total_score']})"
+                    )
+
+        if not mismatched:
+            self.stdout.write(self.style.SUCCESS("All quiz aggregates are consistent."))
+            return
+
+        if options['fix']:
+            Quiz.objects.filter(pk__in=mismatched).update(**question_aggregates())
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt aggregates for {len(mismatched)} quizzes."))
+            return
+
+        raise CommandError(f"{len(mismatched)} quizzes have inconsistent aggregates.")
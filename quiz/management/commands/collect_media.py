@@ -0,0 +1,128 @@
+import re
+import time
+from datetime import timedelta
+from posixpath import join
+from urllib.parse import unquote, urlparse
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from authentication.models import Avatar
+from quiz.models.quiz import Quiz, Question
+
+MEDIA_REFERENCE_RE = re.compile(r'''(?:src|href)\s*=\s*["']([^"']+)["']''', re.IGNORECASE)
+
+
+def media_name(url):
+    """
+    Storage name of a media URL found in HTML, or None for other URLs.
+    """
+    path = unquote(urlparse(url).path)
+    if not path.startswith(settings.MEDIA_URL):
+        return None
+    return path[len(settings.MEDIA_URL):]
+
+
+def avatar_media(avatars, batch_size):
+    """
+    Storage names referenced by the ``avatars`` queryset.
+    """
+    names = set()
+    for url, source, sizes in avatars.values_list('url', 'source', 'sizes').iterator(chunk_size=batch_size):
+        names.update([url, source, *(sizes or {}).values()])
+    names.discard(None)
+    names.discard('')
+    return names
+
+
+def referenced_media(batch_size):
+    """
+    Every storage name the database still points at.
+    """
+    names = avatar_media(Avatar.objects.all(), batch_size)
+
+    names.update(Quiz.objects.values_list('file', flat=True).iterator(chunk_size=batch_size))
+
+    for explanation in Question.objects.values_list('explanation', flat=True).iterator(chunk_size=batch_size):
+        for url in MEDIA_REFERENCE_RE.findall(explanation or ''):
+            names.add(media_name(url))
+
+    names.discard(None)
+    names.discard('')
+    return names
+
+
+def walk_storage(directory):
+    """
+    Yield the name of every file below ``directory``, one directory at a time.
+    """
+    if not default_storage.exists(directory):
+        return
+
+    directories, files = default_storage.listdir(directory)
+    for name in files:
+        yield join(directory, name)
+    for name in directories:
+        yield from walk_storage(join(directory, name))
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete media files that no avatar, quiz file or question explanation "
+        "refers to any more. Files younger than the grace period are kept, so "
+        "uploads still being saved or processed are never touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would be deleted.")
+        parser.add_argument('--grace-hours', type=float, default=24)
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--sleep', type=float, default=0.1, help="Seconds to pause between batches.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        started = timezone.now()
+        cutoff = started - timedelta(hours=options['grace_hours'])
+
+        # Built before the walk: anything uploaded after this point is newer
+        # than the cutoff and therefore protected by the grace period, except
+        # for reused avatar files, which flush() re-checks.
+        referenced = referenced_media(batch_size)
+        self.stdout.write(f"{len(referenced)} referenced files.")
+
+        directories = ['avatars', 'quiz_files', settings.CKEDITOR_UPLOAD_PATH.strip('/')]
+        scanned = deleted = freed = 0
+        batch = []
+
+        def flush():
+            nonlocal deleted, freed
+            # Avatar files are content-addressed, so an upload during the
+            # walk can point an avatar at an old file again. process_image
+            # touches the file, and avatars saved since the start are
+            # re-read here in case the touch came after the mtime check.
+            referenced.update(avatar_media(Avatar.objects.filter(updated_at__gte=started), batch_size))
+            for name in batch:
+                if name in referenced or default_storage.get_modified_time(name) > cutoff:
+                    continue
+                size = default_storage.size(name)
+                if options['dry_run']:
+                    self.stdout.write(f"Would delete {name} ({size} bytes)")
+                else:
+                    default_storage.delete(name)
+                deleted += 1
+                freed += size
+            batch.clear()
+
+        for directory in directories:
+            for name in walk_storage(directory):
+                scanned += 1
+                batch.append(name)
+                if len(batch) >= batch_size:
+                    flush()
+                    time.sleep(options['sleep'])
+        flush()
+
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {scanned} files. {verb} {deleted} files ({freed / (1024 * 1024):.1f} MB)."
+        ))
@@ -0,0 +1,51 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db.models import Case, DecimalField, ExpressionWrapper, F, Value, When
+from django.utils import timezone
+from quiz.models.quiz import QuizAttempt
+
+
+class Command(BaseCommand):
+    help = (
+        "Close attempts whose deadline has passed, in small batches: attempts "
+        "with answers become 'completed', untouched ones 'abandoned'. Meant for "
+        "cron, every minute or so."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0.1, help="Seconds to pause between batches.")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        percentage = Case(
+            When(total_questions__gt=0, then=ExpressionWrapper(
+                F('correct_answers') * Value(100.0) / F('total_questions'),
+                output_field=DecimalField(max_digits=5, decimal_places=2)
+            )),
+            default=Value(0),
+            output_field=DecimalField(max_digits=5, decimal_places=2),
+        )
+
+        completed = abandoned = 0
+        while True:
+            ids = list(
+                QuizAttempt.objects.filter(status__in=['started', 'in_progress'], deadline__lte=now)
+                .order_by('deadline')
+                .values_list('pk', flat=True)[:options['batch_size']]
+            )
+            if not ids:
+                break
+
+            # Status is re-checked by each UPDATE, so an attempt answered in
+            # the meantime is picked up again by the next batch.
+            completed += QuizAttempt.objects.filter(pk__in=ids, status='in_progress').update(
+                status='completed',
+                completed_at=F('deadline'),
+                time_taken=F('deadline') - F('started_at'),
+                percentage=percentage,
+            )
+            abandoned += QuizAttempt.objects.filter(pk__in=ids, status='started').update(status='abandoned')
+            time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f"Completed {completed} and abandoned {abandoned} overdue attempts."))
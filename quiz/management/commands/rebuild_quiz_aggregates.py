@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from quiz.models.quiz import Quiz, question_aggregates
+
+
+class Command(BaseCommand):
+    help = "Recompute Quiz.question_count and Quiz.total_score from the questions table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quiz', type=int, action='append', dest='quiz_ids', help="Only rebuild these quiz ids.")
+
+    def handle(self, *args, **options):
+        quizzes = Quiz.objects.all()
+        if options['quiz_ids']:
+            quizzes = quizzes.filter(pk__in=options['quiz_ids'])
+
+        updated = quizzes.update(**question_aggregates())
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt aggregates for {updated} quizzes."))
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from quiz.models.quiz import UserAnswer
+from quiz.models.statistic import UserCategoryStatistic, UserTopicStatistic, answer_aggregates
+from quiz.cache import bump_statistics_version
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-user category and topic statistics rollups from UserAnswer."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='user_ids', help="Only rebuild these user ids.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user_ids = options['user_ids']
+        batch_size = options['batch_size']
+
+        answers = UserAnswer.objects.all()
+        category_statistics = UserCategoryStatistic.objects.all()
+        topic_statistics = UserTopicStatistic.objects.all()
+        if user_ids:
+            answers = answers.filter(attempt__user_id__in=user_ids)
+            category_statistics = category_statistics.filter(user_id__in=user_ids)
+            topic_statistics = topic_statistics.filter(user_id__in=user_ids)
+
+        rollups = [
+            (UserCategoryStatistic, category_statistics, 'category_id', 'attempt__quiz__category_id'),
+            (UserTopicStatistic, topic_statistics, 'topic_id', 'question__topic_id'),
+        ]
+
+        rebuilt_users = set(user_ids or [])
+
+        with transaction.atomic():
+            for model, existing, key, path in rollups:
+                existing.delete()
+
+                rows = answers.order_by().values('attempt__user_id', path).annotate(**answer_aggregates())
+                created = 0
+                batch = []
+                for row in rows.iterator(chunk_size=batch_size):
+                    user_id = row.pop('attempt__user_id')
+                    rebuilt_users.add(user_id)
+                    batch.append(model(user_id=user_id, **{key: row.pop(path)}, **row))
+                    if len(batch) >= batch_size:
+                        created += len(model.objects.bulk_create(batch))
+                        batch = []
+                if batch:
+                    created += len(model.objects.bulk_create(batch))
+
+                self.stdout.write(f"{model.__name__}: {created} rows")
+
+        for user_id in rebuilt_users:
+            bump_statistics_version(user_id)
+
+        self.stdout.write(self.style.SUCCESS("Statistics rebuilt."))
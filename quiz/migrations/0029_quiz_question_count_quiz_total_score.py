@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:07
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def populate_quiz_aggregates(apps, schema_editor):
+    Quiz = apps.get_model('quiz', 'Quiz')
+    Question = apps.get_model('quiz', 'Question')
+
+    questions = Question.objects.filter(quiz=models.OuterRef('pk')).order_by().values('quiz')
+    Quiz.objects.update(
+        question_count=Coalesce(models.Subquery(questions.annotate(count=models.Count('pk')).values('count')), 0),
+        total_score=Coalesce(models.Subquery(questions.annotate(total=models.Sum('score')).values('total')), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0028_rename_link_topic_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='question_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='total_score',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_quiz_aggregates, migrations.RunPython.noop),
+    ]
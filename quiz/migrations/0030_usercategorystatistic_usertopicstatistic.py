@@ -0,0 +1,71 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from quiz.models.statistic import answer_aggregates
+
+
+def populate_statistics(apps, schema_editor):
+    UserAnswer = apps.get_model('quiz', 'UserAnswer')
+    rollups = [
+        (apps.get_model('quiz', 'UserCategoryStatistic'), 'category_id', 'attempt__quiz__category_id'),
+        (apps.get_model('quiz', 'UserTopicStatistic'), 'topic_id', 'question__topic_id'),
+    ]
+
+    for model, key, path in rollups:
+        rows = UserAnswer.objects.order_by().values('attempt__user_id', path).annotate(**answer_aggregates())
+        batch = []
+        for row in rows.iterator(chunk_size=1000):
+            batch.append(model(user_id=row.pop('attempt__user_id'), **{key: row.pop(path)}, **row))
+            if len(batch) >= 1000:
+                model.objects.bulk_create(batch)
+                batch = []
+        model.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0007_preferences'),
+        ('quiz', '0029_quiz_question_count_quiz_total_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserCategoryStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_answers', models.IntegerField(default=0)),
+                ('total_errors', models.IntegerField(default=0)),
+                ('total_time', models.BigIntegerField(default=0, help_text='Summed answer time in seconds')),
+                ('answers_a', models.IntegerField(default=0)),
+                ('answers_b', models.IntegerField(default=0)),
+                ('answers_g', models.IntegerField(default=0)),
+                ('answers_d', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_statistics', to='quiz.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='category_statistics', to='authentication.user')),
+            ],
+            options={
+                'unique_together': {('user', 'category')},
+            },
+        ),
+        migrations.CreateModel(
+            name='UserTopicStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_answers', models.IntegerField(default=0)),
+                ('total_errors', models.IntegerField(default=0)),
+                ('total_time', models.BigIntegerField(default=0, help_text='Summed answer time in seconds')),
+                ('answers_a', models.IntegerField(default=0)),
+                ('answers_b', models.IntegerField(default=0)),
+                ('answers_g', models.IntegerField(default=0)),
+                ('answers_d', models.IntegerField(default=0)),
+                ('topic', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_statistics', to='quiz.topic')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='topic_statistics', to='authentication.user')),
+            ],
+            options={
+                'unique_together': {('user', 'topic')},
+            },
+        ),
+        migrations.RunPython(populate_statistics, migrations.RunPython.noop),
+    ]
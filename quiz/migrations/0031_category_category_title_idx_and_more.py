@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0030_usercategorystatistic_usertopicstatistic'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['title', 'id'], name='category_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['category', '-created_at', '-id'], name='quiz_category_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['user', '-started_at', '-id'], name='attempt_user_started_idx'),
+        ),
+    ]
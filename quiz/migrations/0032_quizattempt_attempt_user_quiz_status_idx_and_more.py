@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0031_category_category_title_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['user', 'quiz', 'status'], name='attempt_user_quiz_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useranswer',
+            index=models.Index(fields=['attempt', 'is_correct'], name='answer_attempt_correct_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usercategoryaccess',
+            index=models.Index(fields=['user', 'category', 'is_active', 'expires_at'], name='access_user_category_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:27
+
+from datetime import timedelta
+from django.db import migrations, models
+
+
+def populate_deadlines(apps, schema_editor):
+    QuizAttempt = apps.get_model('quiz', 'QuizAttempt')
+
+    attempts = QuizAttempt.objects.filter(deadline=None).select_related('quiz').only('started_at', 'quiz__time_limit')
+    batch = []
+    for attempt in attempts.iterator(chunk_size=1000):
+        attempt.deadline = attempt.started_at + timedelta(minutes=attempt.quiz.time_limit)
+        batch.append(attempt)
+        if len(batch) >= 1000:
+            QuizAttempt.objects.bulk_update(batch, ['deadline'])
+            batch = []
+    QuizAttempt.objects.bulk_update(batch, ['deadline'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0032_quizattempt_attempt_user_quiz_status_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizattempt',
+            name='deadline',
+            field=models.DateTimeField(blank=True, help_text='When the quiz time limit runs out', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(fields=['status', 'deadline'], name='attempt_status_deadline_idx'),
+        ),
+        migrations.RunPython(populate_deadlines, migrations.RunPython.noop),
+    ]
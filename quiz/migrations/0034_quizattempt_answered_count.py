@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:02
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def populate_answered_count(apps, schema_editor):
+    QuizAttempt = apps.get_model('quiz', 'QuizAttempt')
+    UserAnswer = apps.get_model('quiz', 'UserAnswer')
+
+    answers = UserAnswer.objects.filter(attempt=models.OuterRef('pk')).order_by().values('attempt')
+    QuizAttempt.objects.update(
+        answered_count=Coalesce(models.Subquery(answers.annotate(count=models.Count('pk')).values('count')), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz', '0033_quizattempt_deadline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizattempt',
+            name='answered_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_answered_count, migrations.RunPython.noop),
+    ]
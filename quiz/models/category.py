@@ -2,6 +2,7 @@ from django.db import models
 from django.utils import timezone
 from datetime import timedelta
 from authentication.models.user import User
+from ..cache import get_entitlements
 
 
 class Category(models.Model):
@@ -15,20 +16,21 @@ class Category(models.Model):
     class Meta:
         verbose_name_plural = "Categories"
         ordering = ['title']
+        indexes = [
+            models.Index(fields=['title', 'id'], name='category_title_idx'),
+        ]
 
-    def has_access(self, user):
+    def has_access(self, user, access_map=None):
         if not self.is_paid:
             return True 
         
         if not user:
             return False
 
-        return UserCategoryAccess.objects.filter(
-            user=user,
-            category=self,
-            is_active=True,
-            expires_at__gt=timezone.now()
-        ).exists()
+        if access_map is None:
+            access_map = UserCategoryAccess.get_cached_access_map(user)
+
+        return self.id in access_map
 
 
     def __str__(self):
@@ -44,10 +46,41 @@ class UserCategoryAccess(models.Model):
 
     class Meta:
         ordering = ['-access_granted_at']
+        indexes = [
+            models.Index(fields=['user', 'category', 'is_active', 'expires_at'], name='access_user_category_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user} has access to {self.category.title} until {self.expires_at}"
 
+    @classmethod
+    def get_access_map(cls, user):
+        """
+        Map of category id -> latest expiry over the user's active, unexpired
+        accesses, loaded in a single query.
+        """
+        access_map = {}
+        accesses = cls.objects.filter(
+            user=user,
+            is_active=True,
+            expires_at__gt=timezone.now()
+        ).values_list('category_id', 'expires_at')
+
+        for category_id, expires_at in accesses:
+            if category_id not in access_map or expires_at > access_map[category_id]:
+                access_map[category_id] = expires_at
+        return access_map
+
+    @classmethod
+    def get_cached_access_map(cls, user):
+        access_map = get_entitlements(user.id, lambda: cls.get_access_map(user))
+        now = timezone.now()
+        return {
+            category_id: expires_at
+            for category_id, expires_at in access_map.items()
+            if expires_at > now
+        }
+
     @property
     def is_access_active(self):
         return self.is_active and timezone.now() < self.expires_at
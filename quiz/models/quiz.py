@@ -1,7 +1,13 @@
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from authentication.models.user import User
+from .statistic import record_answer_statistics
+from ..cache import bump_statistics_version
+from django.db import transaction
 from ckeditor_uploader.fields import RichTextUploadingField
 import uuid
+from datetime import timedelta
 import os
 from django.core.exceptions import ValidationError
 
@@ -23,6 +29,9 @@ class Quiz(models.Model):
 
     time_limit = models.IntegerField(default=30)
 
+    question_count = models.IntegerField(default=0, editable=False)
+    total_score = models.IntegerField(default=0, editable=False)
+
     file = models.FileField(
         upload_to=unique_file_upload_path,
         validators=[validate_pdf],
@@ -35,12 +44,19 @@ class Quiz(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['category', '-created_at', '-id'], name='quiz_category_created_idx'),
+        ]
     
     def get_total_questions(self):
-        return self.questions.all().count()
+        return self.question_count
 
     def get_total_score(self):
-        return self.questions.aggregate(total=models.Sum('score'))['total'] or 0
+        return self.total_score
+
+    def refresh_aggregates(self):
+        Quiz.objects.filter(pk=self.pk).update(**question_aggregates())
+        self.refresh_from_db(fields=['question_count', 'total_score'])
 
     def __str__(self):
         return f"{self.title} - {self.category.title}"
@@ -62,55 +78,107 @@ class QuizAttempt(models.Model):
 
     total_questions = models.IntegerField(default=0) 
     correct_answers = models.IntegerField(default=0)
+    answered_count = models.IntegerField(default=0, editable=False)
 
     percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0.00)
     
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
     time_taken = models.DurationField(null=True, blank=True)
+    deadline = models.DateTimeField(null=True, blank=True, help_text="When the quiz time limit runs out")
     
     class Meta:
         ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['user', '-started_at', '-id'], name='attempt_user_started_idx'),
+            models.Index(fields=['user', 'quiz', 'status'], name='attempt_user_quiz_status_idx'),
+            models.Index(fields=['status', 'deadline'], name='attempt_status_deadline_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user} - {self.quiz.title} ({self.get_status_display()})"
 
-    def get_remaining_time_from_answers(self):
-        total_time_taken = self.user_answers.aggregate(
-            total=models.Sum('time_taken')
-        )['total']
-
-        quiz_time_limit_seconds = self.quiz.time_limit * 60 
+    def save(self, *args, **kwargs):
+        if self.pk is None and self.deadline is None:
+            self.deadline = timezone.now() + timedelta(minutes=self.quiz.time_limit)
+        super().save(*args, **kwargs)
 
-        if total_time_taken is None:
-            return quiz_time_limit_seconds
+    def get_remaining_time(self):
+        """
+        Seconds left until the deadline; for a completed attempt, the time
+        that was left when it was completed.
+        """
+        if self.deadline is None:
+            return self.quiz.time_limit * 60
 
-        remaining_time = quiz_time_limit_seconds - total_time_taken
-        return max(0, remaining_time)
+        end = self.completed_at or timezone.now()
+        return max(0, round((self.deadline - end).total_seconds()))
 
-    def calculate_results(self):
+    def calculate_results(self, commit=True):
         if self.total_questions > 0:
             self.percentage = (self.correct_answers / self.total_questions) * 100
         else:
             self.percentage = 0
-        self.save()
+        if commit:
+            self.save()
+
+    def register_answers(self, user_answers):
+        """
+        Apply freshly inserted ``user_answers`` to the attempt counters and
+        completion state with a single UPDATE, mirroring the result on this
+        instance, and add them to the user's statistics rollups once the
+        transaction commits. Call it inside a transaction that fetched the
+        attempt with ``select_for_update`` so concurrent submissions are
+        serialized.
+        """
+        correct = sum(1 for user_answer in user_answers if user_answer.is_correct)
+        score = sum(user_answer.score_earned for user_answer in user_answers)
+
+        self.answered_count += len(user_answers)
+        self.correct_answers += correct
+        self.score += score
+        self.total_questions = self.quiz.question_count
+
+        if self.answered_count >= self.total_questions:
+            self.status = 'completed'
+            self.completed_at = timezone.now()
+            self.time_taken = self.completed_at - self.started_at
+            self.calculate_results(commit=False)
+        else:
+            self.status = 'in_progress'
+
+        QuizAttempt.objects.filter(pk=self.pk).update(
+            answered_count=models.F('answered_count') + len(user_answers),
+            correct_answers=models.F('correct_answers') + correct,
+            score=models.F('score') + score,
+            total_questions=self.total_questions,
+            status=self.status,
+            completed_at=self.completed_at,
+            time_taken=self.time_taken,
+            percentage=self.percentage,
+        )
+        # The rollups are written after the attempt's row lock is released.
+        # Should that fail, rebuild_statistics recomputes them from the answers.
+        category_id = self.quiz.category_id
+        transaction.on_commit(
+            lambda: record_answer_statistics(self.user_id, category_id, user_answers), robust=True
+        )
+        transaction.on_commit(lambda: bump_statistics_version(self.user_id))
     
     def get_questions(self):
         try:
-            return self.quiz.questions.all()
+            return Question.objects.filter(quiz_id=self.quiz_id)
         except Question.DoesNotExist:
             return None
         
     def get_question_by_id(self, question_id):
         try:
-            return self.quiz.questions.get(id=question_id)
+            return Question.objects.select_related('quiz').get(quiz_id=self.quiz_id, id=question_id)
         except Question.DoesNotExist:
             return None
 
     def is_quiz_completed(self):
-        total_questions = self.quiz.questions.count()
-        interacted_questions = self.user_answers.count()
-        return interacted_questions >= total_questions
+        return self.answered_count >= self.quiz.question_count
 
 class Topic(models.Model):
     name = models.CharField(max_length=255)
@@ -138,6 +206,15 @@ class Question(models.Model):
     
     class Meta:
         ordering = ['quiz', 'order']
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remembered so the quiz aggregates can be adjusted by the difference
+        # when this question is saved or deleted (see quiz.signals).
+        if 'quiz_id' in field_names and 'score' in field_names:
+            instance._aggregate_snapshot = (instance.quiz_id, instance.score)
+        return instance
     
     def save(self, *args, **kwargs):
         if self._state.adding and self.order == 0:
@@ -150,6 +227,21 @@ class Question(models.Model):
     def __str__(self):
         return f"{self.quiz.title} - Q{self.order}"
 
+def question_aggregates():
+    """
+    Expressions computing a quiz's question_count and total_score from its
+    questions, usable in both ``annotate`` and ``update`` on Quiz querysets.
+    """
+    questions = Question.objects.filter(quiz=models.OuterRef('pk')).order_by().values('quiz')
+    return {
+        'question_count': Coalesce(
+            models.Subquery(questions.annotate(count=models.Count('pk')).values('count')), 0
+        ),
+        'total_score': Coalesce(
+            models.Subquery(questions.annotate(total=models.Sum('score')).values('total')), 0
+        ),
+    }
+
 class UserAnswer(models.Model):
     ANSWER_CHOICES = [
         ('a', 'A'),
@@ -169,6 +261,9 @@ class UserAnswer(models.Model):
     class Meta:
         unique_together = ['attempt', 'question']
         ordering = ['answered_at']
+        indexes = [
+            models.Index(fields=['attempt', 'is_correct'], name='answer_attempt_correct_idx'),
+        ]
     
     def __str__(self):
         return f"{self.attempt.user} - ({'✓' if self.is_correct else '✗'})"
\ No newline at end of file
@@ -0,0 +1,101 @@
+from collections import defaultdict
+from django.db import models, transaction, IntegrityError
+from django.db.models.functions import Coalesce
+from authentication.models.user import User
+
+ANSWER_LETTERS = ['a', 'b', 'g', 'd']
+
+
+def answer_aggregates():
+    """
+    Aggregates over UserAnswer rows producing the rollup fields, for use with
+    ``values(...).annotate(**answer_aggregates())``.
+    """
+    return {
+        'total_answers': models.Count('pk'),
+        'total_errors': models.Count('pk', filter=models.Q(is_correct=False)),
+        'total_time': Coalesce(models.Sum('time_taken'), 0),
+        **{
+            f'answers_{letter}': models.Count('pk', filter=models.Q(selected_answer=letter))
+            for letter in ANSWER_LETTERS
+        }
+    }
+
+
+def answer_totals(user_answers):
+    totals = {
+        'total_answers': 0,
+        'total_errors': 0,
+        'total_time': 0,
+        **{f'answers_{letter}': 0 for letter in ANSWER_LETTERS}
+    }
+    for user_answer in user_answers:
+        totals['total_answers'] += 1
+        totals['total_errors'] += 0 if user_answer.is_correct else 1
+        totals['total_time'] += int(user_answer.time_taken or 0)
+        if user_answer.selected_answer in ANSWER_LETTERS:
+            totals[f'answers_{user_answer.selected_answer}'] += 1
+    return totals
+
+
+class AnswerStatistic(models.Model):
+    total_answers = models.IntegerField(default=0)
+    total_errors = models.IntegerField(default=0)
+    total_time = models.BigIntegerField(default=0, help_text="Summed answer time in seconds")
+
+    answers_a = models.IntegerField(default=0)
+    answers_b = models.IntegerField(default=0)
+    answers_g = models.IntegerField(default=0)
+    answers_d = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def record(cls, totals, **lookup):
+        increments = {field: models.F(field) + value for field, value in totals.items()}
+
+        if cls.objects.filter(**lookup).update(**increments):
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(**lookup, **totals)
+        except IntegrityError:
+            # Another request created the row first.
+            cls.objects.filter(**lookup).update(**increments)
+
+
+class UserCategoryStatistic(AnswerStatistic):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='category_statistics')
+    category = models.ForeignKey('Category', on_delete=models.CASCADE, related_name='user_statistics')
+
+    class Meta:
+        unique_together = ['user', 'category']
+
+    def __str__(self):
+        return f"{self.user} - {self.category.title} ({self.total_answers} answers)"
+
+
+class UserTopicStatistic(AnswerStatistic):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='topic_statistics')
+    topic = models.ForeignKey('Topic', on_delete=models.CASCADE, related_name='user_statistics')
+
+    class Meta:
+        unique_together = ['user', 'topic']
+
+    def __str__(self):
+        return f"{self.user} - {self.topic.name} ({self.total_answers} answers)"
+
+
+def record_answer_statistics(user_id, category_id, user_answers):
+    """
+    Add newly created answers of one user in one category to the rollups.
+    """
+    by_topic = defaultdict(list)
+    for user_answer in user_answers:
+        by_topic[user_answer.question.topic_id].append(user_answer)
+
+    UserCategoryStatistic.record(answer_totals(user_answers), user_id=user_id, category_id=category_id)
+    for topic_id, topic_answers in by_topic.items():
+        UserTopicStatistic.record(answer_totals(topic_answers), user_id=user_id, topic_id=topic_id)
@@ -1,6 +1,5 @@
 from rest_framework import serializers
 from ..models.category import Category, UserCategoryAccess
-from django.utils import timezone
 
 class CategorySerializer(serializers.ModelSerializer):
     has_access = serializers.SerializerMethodField()
@@ -10,28 +9,29 @@ class CategorySerializer(serializers.ModelSerializer):
         model = Category
         fields = ['id', 'title', 'price', 'is_paid', 'description', 'has_access', 'access_expires_at']
 
+    def get_access_map(self):
+        # Stored on the shared context so a list of categories loads the
+        # user's accesses once instead of querying per category.
+        if 'access_map' not in self.context:
+            user = self.context.get('request').user
+            self.context['access_map'] = UserCategoryAccess.get_cached_access_map(user)
+        return self.context['access_map']
+
     def get_has_access(self, obj):
         if not obj.is_paid:
             return True
         
         user = self.context.get('request').user
-        return obj.has_access(user)
+        if not user or user.is_anonymous:
+            return False
+        return obj.has_access(user, access_map=self.get_access_map())
 
     def get_access_expires_at(self, obj):
         user = self.context.get('request').user
         if not user or user.is_anonymous or not obj.is_paid:
             return None
             
-        try:
-            access = UserCategoryAccess.objects.get(
-                user=user,
-                category=obj,
-                expires_at__gt=timezone.now(),
-                is_active=True
-            )
-            return access.expires_at
-        except UserCategoryAccess.DoesNotExist:
-            return None
+        return self.get_access_map().get(obj.id)
         
 
 class UserCategoryAccessSerializer(serializers.ModelSerializer):
@@ -1,5 +1,6 @@
 from quiz.models.quiz import Quiz, QuizAttempt, Question, UserAnswer, Topic
 from rest_framework import serializers
+from django.db.models import Prefetch
 
 class TopicSerializer(serializers.ModelSerializer):
     class Meta:
@@ -21,6 +22,12 @@ class QuestionWithCorrectSerializer(serializers.ModelSerializer):
         fields = ['id', 'explanation', 'score', 'order', 'answer', 'user_answer', 'topic']
 
     def get_user_answer(self, obj):
+        user_answers = self.context.get("user_answers")
+
+        if user_answers is not None:
+            user_answer = user_answers.get(obj.id)
+            return UserAnswerSerializer(user_answer).data if user_answer else None
+
         attempt_id = self.context.get("attempt_id")
 
         if not attempt_id:
@@ -48,6 +55,18 @@ class QuizSerializer(serializers.ModelSerializer):
             'created_at', 'attempt', 'file'
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset, user):
+        # The user's attempts come in one prefetch, so serializing a list
+        # costs the same number of queries whatever its length.
+        return queryset.prefetch_related(
+            Prefetch(
+                'attempts',
+                queryset=QuizAttempt.objects.filter(user=user).order_by('-started_at'),
+                to_attr='user_attempts'
+            )
+        )
+
     def get_total_questions(self, obj):
         return obj.get_total_questions()
 
@@ -57,7 +76,10 @@ class QuizSerializer(serializers.ModelSerializer):
     def get_attempt(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            attempt = obj.attempts.filter(user=request.user).order_by('-started_at').first()
+            if hasattr(obj, 'user_attempts'):
+                attempt = obj.user_attempts[0] if obj.user_attempts else None
+            else:
+                attempt = obj.attempts.filter(user=request.user).order_by('-started_at').first()
             if attempt:
                 return QuizAttemptSerializer(attempt).data
         return None
@@ -73,7 +95,7 @@ class QuizAttemptSerializer(serializers.ModelSerializer):
                  ]
     
     def get_remaining_time(self, obj):
-        return obj.get_remaining_time_from_answers()
+        return obj.get_remaining_time()
         
 class UserAnswerSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,76 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models.quiz import Quiz, Question, Topic
+from .models.category import UserCategoryAccess
+from .cache import invalidate_entitlements, bump_quiz_content_version
+
+
+def adjust_quiz_aggregates(quiz_id, count_delta, score_delta):
+    if count_delta or score_delta:
+        Quiz.objects.filter(pk=quiz_id).update(
+            question_count=F('question_count') + count_delta,
+            total_score=F('total_score') + score_delta,
+        )
+
+
+def quiz_content_changed(*quiz_ids):
+    quiz_ids = set(quiz_ids)
+    transaction.on_commit(lambda: bump_quiz_content_version(*quiz_ids))
+
+
+@receiver(post_save, sender=Question)
+def question_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    snapshot = getattr(instance, '_aggregate_snapshot', None)
+
+    # A question moved to another quiz changes the content of both.
+    quiz_content_changed(instance.quiz_id, *(snapshot[:1] if snapshot else ()))
+
+    if created:
+        adjust_quiz_aggregates(instance.quiz_id, 1, instance.score)
+    elif snapshot is None:
+        # Saved without being loaded from the database first, so the previous
+        # values are unknown; recompute the quiz from its questions instead.
+        instance.quiz.refresh_aggregates()
+    else:
+        previous_quiz_id, previous_score = snapshot
+        if previous_quiz_id != instance.quiz_id:
+            adjust_quiz_aggregates(previous_quiz_id, -1, -previous_score)
+            adjust_quiz_aggregates(instance.quiz_id, 1, instance.score)
+        else:
+            adjust_quiz_aggregates(instance.quiz_id, 0, instance.score - previous_score)
+
+    instance._aggregate_snapshot = (instance.quiz_id, instance.score)
+
+
+@receiver(post_delete, sender=Question)
+def question_deleted(sender, instance, **kwargs):
+    quiz_id, score = getattr(instance, '_aggregate_snapshot', (instance.quiz_id, instance.score))
+    adjust_quiz_aggregates(quiz_id, -1, -score)
+    quiz_content_changed(quiz_id)
+
+
+@receiver(post_save, sender=UserCategoryAccess)
+@receiver(post_delete, sender=UserCategoryAccess)
+def category_access_changed(sender, instance, **kwargs):
+    # Covers Payment.mark_completed as well as admin edits and deletes.
+    transaction.on_commit(lambda: invalidate_entitlements(instance.user_id))
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def quiz_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        quiz_content_changed(instance.pk)
+
+
+@receiver(post_save, sender=Topic)
+def topic_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    quiz_ids = Question.objects.filter(topic=instance).values_list('quiz_id', flat=True).distinct()
+    quiz_content_changed(*quiz_ids)
@@ -0,0 +1,122 @@
+from django.conf import settings
+from django.db.models import F
+from .models.quiz import UserAnswer
+from .models.statistic import UserCategoryStatistic, UserTopicStatistic, ANSWER_LETTERS, answer_aggregates
+
+TOTAL_FIELDS = ['total_answers', 'total_errors', 'total_time'] + [f'answers_{letter}' for letter in ANSWER_LETTERS]
+
+
+def percentage(correct, total):
+    return round((correct / total) * 100, 2) if total > 0 else 0
+
+
+def rollup_statistic_rows(user):
+    """
+    Category and topic rows read from the precomputed rollup tables.
+    """
+    categories = UserCategoryStatistic.objects.filter(user=user, total_answers__gt=0).values(
+        *TOTAL_FIELDS, label=F('category__title')
+    )
+    topics = UserTopicStatistic.objects.filter(user=user, total_answers__gt=0).values(
+        *TOTAL_FIELDS, label=F('topic__name')
+    )
+    return categories, topics
+
+
+def answer_statistic_rows(user):
+    """
+    Category and topic rows aggregated directly from the user's answers, one
+    grouped query each. Overall and per-letter figures are summed from the
+    category rows, so no further queries are needed.
+    """
+    answers = UserAnswer.objects.filter(attempt__user=user).order_by()
+
+    categories = answers.values('attempt__quiz__category_id', label=F('attempt__quiz__category__title')).annotate(
+        **answer_aggregates()
+    )
+    topics = answers.values('question__topic_id', label=F('question__topic__name')).annotate(
+        **answer_aggregates()
+    )
+    return categories, topics
+
+
+def statistic_querysets(user):
+    if getattr(settings, 'STATISTICS_SOURCE', 'rollup') == 'answers':
+        return answer_statistic_rows(user)
+    return rollup_statistic_rows(user)
+
+
+def get_statistic_rows(user):
+    categories, topics = statistic_querysets(user)
+    return list(categories), list(topics)
+
+
+async def aget_statistic_rows(user):
+    categories, topics = statistic_querysets(user)
+    return [row async for row in categories], [row async for row in topics]
+
+
+def build_statistics(category_rows, topic_rows):
+    category_rows = sorted(category_rows, key=lambda row: (-row['total_errors'], row['label']))
+    topic_rows = sorted(topic_rows, key=lambda row: (-row['total_errors'], row['label']))
+
+    def average_time(row):
+        return round(row['total_time'] / row['total_answers'], 2) if row['total_answers'] else 0
+
+    # === Category Stats ===
+    categories_chart = {
+        "labels": [c['label'] for c in category_rows],
+        "datasets": {
+            "total_errors": [c['total_errors'] for c in category_rows],
+            "error_percentages": [percentage(c['total_errors'], c['total_answers']) for c in category_rows],
+            "average_time_seconds": [average_time(c) for c in category_rows],
+        }
+    }
+
+    # === Topic Stats ===
+    topics_chart = {
+        "labels": [t['label'] for t in topic_rows],
+        "datasets": {
+            "total_errors": [t['total_errors'] for t in topic_rows],
+            "error_percentages": [percentage(t['total_errors'], t['total_answers']) for t in topic_rows],
+            "average_time_seconds": [average_time(t) for t in topic_rows],
+        }
+    }
+
+    # === Answer Distribution (for Pie/Bar chart) ===
+    answer_distribution_chart = {
+        "labels": [letter.upper() for letter in ANSWER_LETTERS],
+        "datasets": {
+            "counts": [sum(c[f'answers_{letter}'] for c in category_rows) for letter in ANSWER_LETTERS]
+        }
+    }
+
+    # === Topic Accuracy (Correct vs Incorrect)
+    topic_accuracy_chart = {
+        "labels": [t['label'] for t in topic_rows],
+        "datasets": {
+            "correct": [t['total_answers'] - t['total_errors'] for t in topic_rows],
+            "incorrect": [t['total_errors'] for t in topic_rows],
+            "accuracy_percentage": [percentage(t['total_answers'] - t['total_errors'], t['total_answers']) for t in topic_rows]
+        }
+    }
+
+    # === Overall Stats ===
+    total_answers = sum(c['total_answers'] for c in category_rows)
+    total_errors = sum(c['total_errors'] for c in category_rows)
+    total_time = sum(c['total_time'] for c in category_rows)
+
+    overall_stats = {
+        "total_answers": total_answers,
+        "total_errors": total_errors,
+        "accuracy": percentage(total_answers - total_errors, total_answers),
+        "average_time_seconds": round(total_time / total_answers, 2) if total_answers else 0
+    }
+
+    return {
+        "overall": overall_stats,
+        "categories": categories_chart,
+        "topics": topics_chart,
+        "answer_distribution": answer_distribution_chart,
+        "topic_accuracy": topic_accuracy_chart
+    }
@@ -0,0 +1,312 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from authentication.models import User, UserSession
+from quiz.models.category import Category, UserCategoryAccess
+from quiz.models.quiz import Quiz, Question, QuizAttempt, Topic, UserAnswer
+from quiz.models.statistic import UserCategoryStatistic, UserTopicStatistic
+from quiz.cache import _entitlements
+from quiz.content import get_quiz_content
+from quiz.management.commands.check_query_plans import hot_queries, full_scans
+
+
+class QuizTestCase(TestCase):
+    """
+    A user with access to paid categories created on demand, logged in on
+    self.client.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='quiz@example.com', firstname='Quiz', lastname='Taker')
+        cls.topic = Topic.objects.create(name='Topic', url='https://example.com/topic')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def clear_caches(self):
+        cache.clear()
+        _entitlements.clear()
+
+    def create_category(self, title):
+        category = Category.objects.create(title=title, price=10, is_paid=True)
+        UserCategoryAccess.objects.create(
+            user=self.user, category=category, expires_at=timezone.now() + timedelta(days=30)
+        )
+        return category
+
+    def create_quiz(self, category, questions=0):
+        quiz = Quiz.objects.create(title='Quiz', category=category)
+        Question.objects.bulk_create(
+            Question(topic=self.topic, quiz=quiz, explanation='Explanation', answer='a', order=order)
+            for order in range(questions)
+        )
+        quiz.refresh_aggregates()
+        return quiz
+
+
+class QueryCountTestCase(QuizTestCase):
+    """
+    Endpoints whose query count must not grow with the amount of data they
+    return. Caches are emptied first so every request starts cold.
+    """
+
+    def test_quiz_list(self):
+        for quizzes in (1, 25):
+            with self.subTest(quizzes=quizzes):
+                category = self.create_category(f'Category {quizzes}')
+                for _ in range(quizzes):
+                    QuizAttempt.objects.create(user=self.user, quiz=self.create_quiz(category, questions=3))
+
+                self.clear_caches()
+                with self.assertNumQueries(4):
+                    response = self.client.get(f'/api/v2/quiz/category/{category.id}/quizzes/')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data), quizzes)
+
+    def test_quiz_questions(self):
+        category = self.create_category('Questions')
+        for questions in (10, 100, 1000):
+            with self.subTest(questions=questions):
+                quiz = self.create_quiz(category, questions=questions)
+                attempt = QuizAttempt.objects.create(user=self.user, quiz=quiz)
+                UserAnswer.objects.bulk_create(
+                    UserAnswer(attempt=attempt, question=question, selected_answer='b')
+                    for question in quiz.questions.all()[:questions // 2]
+                )
+
+                self.clear_caches()
+                # Attempt, answers and, while the content is not cached, questions.
+                with self.assertNumQueries(3):
+                    response = self.client.get(f'/api/v2/quiz/attempts/{attempt.id}/questions')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data), questions)
+
+                with self.assertNumQueries(2):
+                    self.client.get(f'/api/v2/quiz/attempts/{attempt.id}/questions')
+
+    def test_category_list(self):
+        for categories in (1, 25):
+            with self.subTest(categories=categories):
+                Category.objects.all().delete()
+                for index in range(categories):
+                    if index % 2:
+                        Category.objects.create(title=f'Free {index}', price=0)
+                    else:
+                        self.create_category(f'Paid {index}')
+
+                self.clear_caches()
+                # Categories and, until it is cached, the user's access map.
+                with self.assertNumQueries(2):
+                    response = self.client.get('/api/v2/category/list/')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data), categories)
+
+                with self.assertNumQueries(1):
+                    self.client.get('/api/v2/category/list/')
+
+    def test_answer(self):
+        quiz = self.create_quiz(self.create_category('Answer'), questions=3)
+        attempt = QuizAttempt.objects.create(user=self.user, quiz=quiz)
+        question_ids = list(quiz.questions.values_list('id', flat=True))
+        get_quiz_content(quiz.id)
+
+        for index, question_id in enumerate(question_ids):
+            with self.subTest(answer=index):
+                # Lock, question, insert and attempt update, inside the
+                # test's savepoint; the rollups wait for the commit.
+                with self.captureOnCommitCallbacks() as callbacks:
+                    with self.assertNumQueries(6):
+                        response = self.client.post(
+                            f'/api/v2/quiz/attempts/{attempt.id}/answer',
+                            {'question_id': question_id, 'selected_answer': 'a'},
+                            format='json',
+                        )
+                self.assertEqual(response.status_code, 200)
+
+                # One UPDATE per rollup, plus a savepointed INSERT for each
+                # on the user's first answer.
+                with self.assertNumQueries(8 if index == 0 else 2):
+                    for callback in callbacks:
+                        callback()
+
+        attempt.refresh_from_db()
+        self.assertEqual((attempt.answered_count, attempt.status), (3, 'completed'))
+        self.assertEqual(UserCategoryStatistic.objects.get(user=self.user).total_answers, 3)
+        self.assertEqual(UserTopicStatistic.objects.get(user=self.user).total_answers, 3)
+
+
+class BatchAnswerTestCase(QuizTestCase):
+    """
+    The batch answer endpoint validates every item on its own and saves the
+    valid ones together.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.create_quiz(self.create_category('Batch'), questions=10)
+        self.attempt = QuizAttempt.objects.create(user=self.user, quiz=self.quiz)
+        self.question_ids = list(self.quiz.questions.order_by('order').values_list('id', flat=True))
+
+    def post(self, answers):
+        return self.client.post(f'/api/v2/quiz/attempts/{self.attempt.id}/answers', answers, format='json')
+
+    def test_answers(self):
+        first, second, third = self.question_ids[:3]
+        response = self.post({'answers': [
+            {'question_id': str(first), 'selected_answer': 'a', 'time_taken': '5'},
+            {'question_id': first, 'selected_answer': 'b'},
+            {'question_id': second, 'selected_answer': 'b', 'time_taken': 2.9},
+            {'question_id': True, 'selected_answer': 'a'},
+            {'question_id': third, 'selected_answer': 'z'},
+            {'question_id': third, 'selected_answer': 'a', 'time_taken': True},
+            {'question_id': third, 'selected_answer': 'a', 'time_taken': -1},
+            {'question_id': 0, 'selected_answer': 'a'},
+            'not an answer',
+        ]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(result['status'], result.get('error')) for result in response.data['results']],
+            [
+                ('created', None),
+                ('duplicate', 'You have been answered to this question'),
+                ('created', None),
+                ('invalid', 'Question Doesnot exists'),
+                ('invalid', 'Invalid answer selected'),
+                ('invalid', 'Invalid time taken'),
+                ('invalid', 'Invalid time taken'),
+                ('invalid', 'Question Doesnot exists'),
+                ('invalid', 'Question Doesnot exists'),
+            ]
+        )
+        self.assertEqual(response.data['results'][0]['is_correct'], True)
+        self.assertEqual(
+            list(UserAnswer.objects.filter(attempt=self.attempt).order_by('question__order')
+                 .values_list('question_id', 'time_taken', 'is_correct')),
+            [(first, 5, True), (second, 2, False)]
+        )
+
+        self.attempt.refresh_from_db()
+        self.assertEqual((self.attempt.answered_count, self.attempt.correct_answers), (2, 1))
+        self.assertEqual(self.attempt.status, 'in_progress')
+
+    def test_answers_are_capped_at_the_question_count(self):
+        answers = [{'question_id': question_id, 'selected_answer': 'a'} for question_id in self.question_ids]
+        response = self.post(answers + answers[:1])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(UserAnswer.objects.filter(attempt=self.attempt).exists())
+
+        response = self.post(answers)
+        self.assertEqual(response.status_code, 200)
+        self.attempt.refresh_from_db()
+        self.assertEqual((self.attempt.answered_count, self.attempt.status), (10, 'completed'))
+
+    def test_requires_a_list(self):
+        for body in ({}, {'answers': []}, {'answers': 'a'}):
+            with self.subTest(body=body):
+                self.assertEqual(self.post(body).status_code, 400)
+
+
+class KeysetPaginationTestCase(QuizTestCase):
+    """
+    Cursor paging over the attempt list, ordered by (-started_at, -id).
+    """
+
+    def test_pages(self):
+        quiz = self.create_quiz(self.create_category('Pages'), questions=1)
+        for _ in range(7):
+            QuizAttempt.objects.create(user=self.user, quiz=quiz)
+        # Ties on started_at are broken by id.
+        started_at = timezone.now() - timedelta(hours=1)
+        QuizAttempt.objects.filter(pk__in=QuizAttempt.objects.order_by('id').values('pk')[:4]).update(
+            started_at=started_at
+        )
+        expected = list(QuizAttempt.objects.order_by('-started_at', '-id').values_list('id', flat=True))
+
+        ids = []
+        url = '/api/v2/quiz/attempts/?page_size=3'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 3)
+            ids += [attempt['id'] for attempt in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(ids, expected)
+
+    def test_unpaginated_and_invalid_cursor(self):
+        quiz = self.create_quiz(self.create_category('Pages'), questions=1)
+        QuizAttempt.objects.create(user=self.user, quiz=quiz)
+
+        response = self.client.get('/api/v2/quiz/attempts/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+
+        self.assertEqual(self.client.get('/api/v2/quiz/attempts/?cursor=bogus').status_code, 404)
+
+
+class ExpireAttemptsTestCase(QuizTestCase):
+    """
+    The expire_attempts command closes overdue attempts only.
+    """
+
+    def test_expire_attempts(self):
+        quiz = self.create_quiz(self.create_category('Expire'), questions=4)
+        now = timezone.now()
+        overdue = now - timedelta(minutes=1)
+
+        def create_attempt(status, deadline, **fields):
+            return QuizAttempt.objects.create(
+                user=self.user, quiz=quiz, status=status, deadline=deadline, total_questions=4, **fields
+            )
+
+        answered = create_attempt('in_progress', overdue, correct_answers=3)
+        untouched = create_attempt('started', overdue)
+        running = create_attempt('in_progress', now + timedelta(minutes=5), correct_answers=1)
+        finished = create_attempt('completed', overdue, correct_answers=2, completed_at=overdue - timedelta(minutes=1))
+
+        stdout = StringIO()
+        call_command('expire_attempts', batch_size=1, sleep=0, stdout=stdout)
+        self.assertIn('Completed 1 and abandoned 1 overdue attempts.', stdout.getvalue())
+
+        for attempt in (answered, untouched, running, finished):
+            attempt.refresh_from_db()
+
+        self.assertEqual(answered.status, 'completed')
+        self.assertEqual(answered.completed_at, overdue)
+        self.assertEqual(answered.time_taken, overdue - answered.started_at)
+        self.assertEqual(answered.percentage, Decimal('75.00'))
+        self.assertEqual(untouched.status, 'abandoned')
+        self.assertIsNone(untouched.completed_at)
+        self.assertEqual(running.status, 'in_progress')
+        self.assertEqual(finished.completed_at, overdue - timedelta(minutes=1))
+
+
+class QueryPlanTestCase(TestCase):
+    """
+    The hot queries checked by the check_query_plans command, explained
+    against the test database.
+    """
+
+    def test_hot_queries_use_an_index(self):
+        user = User.objects.create(email='plans@example.com', firstname='Query', lastname='Plan')
+        session = UserSession.objects.create(
+            user=user, session_token='token', expires_at=timezone.now() + timedelta(days=1)
+        )
+        category = Category.objects.create(title='Category', price=0)
+        quiz = Quiz.objects.create(title='Quiz', category=category)
+        question = Question.objects.create(
+            topic=Topic.objects.create(name='Topic', url='https://example.com/topic'),
+            quiz=quiz, explanation='Explanation', answer='a',
+        )
+        attempt = QuizAttempt.objects.create(user=user, quiz=quiz)
+        UserAnswer.objects.create(attempt=attempt, question=question, selected_answer='a', is_correct=True)
+
+        for name, queryset in hot_queries(user, session, quiz, attempt, question).items():
+            with self.subTest(name):
+                self.assertEqual(full_scans(queryset), [])
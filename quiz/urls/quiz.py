@@ -1,13 +1,28 @@
+from django.conf import settings
 from django.urls import path
-from ..views import quiz
+from ..views import quiz, quiz_async
+
+# Under ASGI the hot endpoints can be served by their async versions.
+if getattr(settings, 'ASYNC_VIEWS', False):
+    QuizListView = quiz_async.AsyncQuizListView
+    QuizQuestionsView = quiz_async.AsyncQuizQuestionsView
+    QuizAnswerView = quiz_async.AsyncQuizAnswerView
+    Statistic = quiz_async.AsyncStatistic
+else:
+    QuizListView = quiz.QuizListView
+    QuizQuestionsView = quiz.QuizQuestionsView
+    QuizAnswerView = quiz.QuizAnswerView
+    Statistic = quiz.Statistic
 
 urlpatterns = [
-    path('category/<int:categoryId>/quizzes/', quiz.QuizListView.as_view(), name='quiz-list'),
+    path('category/<int:categoryId>/quizzes/', QuizListView.as_view(), name='quiz-list'),
     path('category/<int:categoryId>/quizzes/<int:quiz_id>/', quiz.QuizDetailView.as_view(), name='quiz-detail'),
     path('category/<int:categoryId>/quizzes/<int:quiz_id>/start/', quiz.QuizStartView.as_view(), name='quiz-start'),
 
-    path('attempts/<int:attempt_id>/questions', quiz.QuizQuestionsView.as_view(), name='quiz-question'),
-    path('attempts/<int:attempt_id>/answer', quiz.QuizAnswerView.as_view(), name='quiz-answer'),
+    path('attempts/', quiz.QuizAttemptListView.as_view(), name='attempt-list'),
+    path('attempts/<int:attempt_id>/questions', QuizQuestionsView.as_view(), name='quiz-question'),
+    path('attempts/<int:attempt_id>/answer', QuizAnswerView.as_view(), name='quiz-answer'),
+    path('attempts/<int:attempt_id>/answers', quiz.QuizBatchAnswerView.as_view(), name='quiz-answer-batch'),
 
-    path('statistics', quiz.Statistic.as_view(), name='statistics')
-]
\ No newline at end of file
+    path('statistics', Statistic.as_view(), name='statistics')
+]
@@ -9,16 +9,20 @@ import uuid
 from rest_framework.views import APIView
 
 from authentication.models.payment import Payment
+from core.pagination import KeysetPagination
+from core.db.routers import ReplicaReadMixin
 
 from ..models.category import Category, UserCategoryAccess
 from ..serializers.category import (
     CategorySerializer,
 )
 
-class CategoryListView(generics.ListAPIView):
+class CategoryListView(ReplicaReadMixin, generics.ListAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('title', 'id')
 
 
 class CategoryDetailView(generics.RetrieveAPIView):
@@ -1,25 +1,27 @@
 from quiz.models.category import Category
 from quiz.models.quiz import Quiz, QuizAttempt, Question
 from rest_framework.views import APIView
+from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
-from django.db import transaction
-from django.db.models import Count, Avg, Max
-from quiz.serializers.quiz import QuizAttemptSerializer, QuizSerializer, QuestionSerializer, QuestionWithCorrectSerializer, UserAnswer
+from django.db import transaction, IntegrityError
+from quiz.serializers.quiz import QuizAttemptSerializer, QuizSerializer, QuestionWithCorrectSerializer, UserAnswer
 
-from django.db.models import Count, Avg, Sum, F, Q, Max, Min, Case, When, IntegerField, FloatField, ExpressionWrapper
-from django.db.models.functions import TruncDate, TruncWeek, TruncMonth, Extract
-from collections import defaultdict
-import math
-from datetime import timedelta, datetime
-from quiz.models.quiz import UserAnswer, Quiz, Question, Topic
+from quiz.models.quiz import UserAnswer, Quiz, Question
+from quiz.statistics import get_statistic_rows, build_statistics
+from quiz.content import get_quiz_content, merge_answer_state
+from quiz.cache import get_statistics_version, get_cached_statistics, set_cached_statistics
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from core.pagination import KeysetPagination
+from core.db.routers import ReplicaReadMixin, pin_to_primary
 
 
-class QuizListView(APIView):
+class QuizListView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
+    keyset_ordering = ('-created_at', '-id')
 
     def get(self, request, categoryId): 
         category = get_object_or_404(Category, id=categoryId)
@@ -31,14 +33,21 @@ class QuizListView(APIView):
                     status=status.HTTP_403_FORBIDDEN
                 )
         
-        quizzes = Quiz.objects.filter(
-            category=category,
+        quizzes = QuizSerializer.setup_eager_loading(
+            Quiz.objects.filter(category=category),
+            request.user
         )
         
         quiz_type = request.query_params.get('type')
         if quiz_type:
             quizzes = quizzes.filter(quiz_type=quiz_type)
 
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(quizzes, request, view=self)
+        if page is not None:
+            serializer = QuizSerializer(page, many=True, context={'request': request})
+            return paginator.get_paginated_response(serializer.data)
+
         serializer = QuizSerializer(quizzes, many=True, context={'request': request})
         return Response(serializer.data)
 
@@ -55,7 +64,11 @@ class QuizDetailView(APIView):
                     status=status.HTTP_403_FORBIDDEN
                 )
         
-        quiz = get_object_or_404(Quiz, id=quiz_id, category=category)
+        quiz = get_object_or_404(
+            QuizSerializer.setup_eager_loading(Quiz.objects.all(), request.user),
+            id=quiz_id,
+            category=category
+        )
         
         serializer = QuizSerializer(quiz, context={'request': request})
         return Response(serializer.data)
@@ -96,6 +109,16 @@ class QuizStartView(APIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
 
+class QuizAttemptListView(generics.ListAPIView):
+    serializer_class = QuizAttemptSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-started_at', '-id')
+
+    def get_queryset(self):
+        return QuizAttempt.objects.filter(user=self.request.user)
+
+
 class QuizQuestionsView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -107,249 +130,201 @@ class QuizQuestionsView(APIView):
             status__in=['started', 'in_progress', 'completed']
         )
 
-        questions = attempt.get_questions()
+        user_answers = {
+            user_answer.question_id: user_answer
+            for user_answer in UserAnswer.objects.filter(attempt=attempt)
+        }
+
+        return Response(merge_answer_state(get_quiz_content(attempt.quiz_id), user_answers))
+        
+def submit_answer(user, attempt_id, data):
+    """
+    Record one answer of ``user`` on the attempt. Returns (payload, status)
+    for QuizAnswerView and its async counterpart.
+    """
+    selected_answer = data.get('selected_answer', None)
+    time_taken = data.get('time_taken', 0)
+    question_id = data.get('question_id')
+
+    if question_id is None:
+        return {'error': 'No question ID provided and no current question available'}, status.HTTP_400_BAD_REQUEST
+
+    if selected_answer is None:
+        return {'error': 'No answers selected'}, status.HTTP_400_BAD_REQUEST
+
+    try:
+        with transaction.atomic():
+            attempt = get_object_or_404(
+                QuizAttempt.objects.select_for_update(),
+                id=attempt_id, 
+                user=user,
+                status__in=['started', 'in_progress']
+            )
 
-        user_answers = UserAnswer.objects.filter(
-            attempt=attempt,
-            attempt__status__in=['started', 'in_progress', 'completed']
-        ).values_list('question_id', flat=True)
+            question = attempt.get_question_by_id(question_id)
+
+            if question is None:
+                return {'error': 'Question Doesnot exists'}, status.HTTP_400_BAD_REQUEST
+
+            # Joined with the question rather than the locked attempt row,
+            # so the quiz row itself is not locked.
+            attempt.quiz = question.quiz
+            is_correct = selected_answer == question.answer
+
+            # The (attempt, question) unique constraint rejects a second
+            # answer to the same question, rolling back the whole submission.
+            user_answer = UserAnswer.objects.create(
+                attempt=attempt,
+                question=question,
+                time_taken=time_taken,
+                selected_answer=selected_answer,
+                is_correct=is_correct,
+                score_earned=question.score if is_correct else 0
+            )
+
+            attempt.register_answers([user_answer])
+    except IntegrityError:
+        return {'error': 'You have been answered to this question'}, status.HTTP_400_BAD_REQUEST
+
+    pin_to_primary(user.pk)
+
+    content = [item for item in get_quiz_content(question.quiz_id) if item['id'] == question.id]
+    if content:
+        question_with_correct_answers = merge_answer_state(content, {question.id: user_answer})[0]
+    else:
+        question_with_correct_answers = QuestionWithCorrectSerializer(
+            question, context={"user_answers": {question.id: user_answer}}
+        ).data
+    serialized_attempt = QuizAttemptSerializer(attempt).data
+
+    return {
+        "updated_question": question_with_correct_answers,
+        "updated_attempt": serialized_attempt,
+    }, status.HTTP_200_OK
 
-        serialized_data = []
-        for question in questions:
-            if question.id in user_answers:
-                serialized = QuestionWithCorrectSerializer(
-                    question, context={"attempt_id": attempt_id}
-                ).data
-            else:
-                serialized = QuestionSerializer(question).data
-            serialized_data.append(serialized)
 
-        return Response(serialized_data)
-        
 class QuizAnswerView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request, attempt_id):
-        attempt = get_object_or_404(
-            QuizAttempt, 
-            id=attempt_id, 
-            user=request.user,
-            status__in=['started', 'in_progress']
-        )
+        data, status_code = submit_answer(request.user, attempt_id, request.data)
+        return Response(data, status=status_code)
+
+def parse_int(value):
+    # Coerced like QuizAnswerView's model fields do (numeric strings, and
+    # floats truncated), but booleans are not numbers here.
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+class QuizBatchAnswerView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        selected_answer = request.data.get('selected_answer', None)
-        time_taken = request.data.get('time_taken', 0)
-        question_id = request.data.get('question_id')
+    def post(self, request, attempt_id):
+        answers = request.data.get('answers') if isinstance(request.data, dict) else request.data
 
-        if question_id is None:
-            return Response(
-                    {'error': 'No question ID provided and no current question available'}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-        question = attempt.get_question_by_id(question_id)
-        
-        if question is None:
+        if not isinstance(answers, list) or not answers:
             return Response(
-                {'error': 'Question Doesnot exists'}, 
+                {'error': 'A non-empty list of answers is required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        if selected_answer is None:
-            return Response(
-                {'error': 'No answers selected'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        existing_answer = UserAnswer.objects.filter(
-            attempt=attempt,
-            question=question
-        ).first()
-
-        if existing_answer:
-            return Response({
-                'error': 'You have been answered to this question',
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        user_answer = UserAnswer.objects.create(
-            attempt=attempt,
-            question=question,
-            time_taken=time_taken,
-            selected_answer=selected_answer
-        )
-
-        selected_correct = selected_answer == question.answer
-
-        if selected_correct:
-            user_answer.is_correct = True
-            user_answer.score_earned = question.score
-            attempt.correct_answers += 1
-            attempt.score += question.score
-                
-        user_answer.save()
-        
-        total_questions = attempt.quiz.questions.count()
-        attempt.total_questions = total_questions
-        
-        if attempt.is_quiz_completed():
-            attempt.status = 'completed'
-            attempt.completed_at = timezone.now()
-            attempt.time_taken = attempt.completed_at - attempt.started_at
-            attempt.calculate_results()
-        else:
-            attempt.status = 'in_progress'
-        
-        attempt.save()
-    
-        question_with_correct_answers = QuestionWithCorrectSerializer(question, context={"attempt_id": attempt_id}).data
-        
-        total_questions = attempt.quiz.questions.count()
-        attempt.total_questions = total_questions
-        serialized_attempt = QuizAttemptSerializer(attempt).data
 
-        return Response({
-            "updated_question": question_with_correct_answers,
-            "updated_attempt": serialized_attempt,
-        })
+        valid_answers = {choice for choice, _ in UserAnswer.ANSWER_CHOICES}
 
-class Statistic(APIView):
-    permission_classes = [IsAuthenticated]
-
-    def get(self, request):
-        user = request.user
-
-        def percentage(correct, total):
-            return round((correct / total) * 100, 2) if total > 0 else 0
-
-        # === Category Stats ===
-        category_stats = Quiz.objects.filter(attempts__user=user).values(
-            'category__title'
-        ).annotate(
-            total_answers=Count(
-                'questions__useranswer',
-                filter=Q(questions__useranswer__attempt__user=user)
-            ),
-            total_errors=Count(
-                'questions__useranswer',
-                filter=Q(
-                    questions__useranswer__is_correct=False,
-                    questions__useranswer__attempt__user=user
-                )
-            ),
-            avg_time=Avg(
-                'questions__useranswer__time_taken',
-                filter=Q(questions__useranswer__attempt__user=user)
-            ),
-        ).annotate(
-            error_percentage=ExpressionWrapper(
-                100 * F('total_errors') / F('total_answers'),
-                output_field=FloatField()
+        with transaction.atomic():
+            attempt = get_object_or_404(
+                QuizAttempt.objects.select_for_update(),
+                id=attempt_id,
+                user=request.user,
+                status__in=['started', 'in_progress']
             )
-        ).filter(total_answers__gt=0).order_by('-total_errors')
-
-        categories_chart = {
-            "labels": [c['category__title'] for c in category_stats],
-            "datasets": {
-                "total_errors": [c['total_errors'] for c in category_stats],
-                "error_percentages": [round(c['error_percentage'], 2) for c in category_stats],
-                "average_time_seconds": [round(c['avg_time'] or 0, 2) for c in category_stats],
-            }
-        }
 
-        # === Topic Stats ===
-        topic_stats = Topic.objects.annotate(
-            total_answers=Count(
-                'questions__useranswer',
-                filter=Q(questions__useranswer__attempt__user=user)
-            ),
-            total_errors=Count(
-                'questions__useranswer',
-                filter=Q(
-                    questions__useranswer__is_correct=False,
-                    questions__useranswer__attempt__user=user
+            question_count = Quiz.objects.values_list('question_count', flat=True).get(pk=attempt.quiz_id)
+            if len(answers) > question_count:
+                return Response(
+                    {'error': f'At most {question_count} answers can be sent for this quiz'},
+                    status=status.HTTP_400_BAD_REQUEST
                 )
-            ),
-            avg_time=Avg(
-                'questions__useranswer__time_taken',
-                filter=Q(questions__useranswer__attempt__user=user)
-            )
-        ).annotate(
-            error_percentage=ExpressionWrapper(
-                100 * F('total_errors') / F('total_answers'),
-                output_field=FloatField()
-            )
-        ).filter(total_answers__gt=0).order_by('-total_errors')
-
-        topics_chart = {
-            "labels": [t.name for t in topic_stats],
-            "datasets": {
-                "total_errors": [t.total_errors for t in topic_stats],
-                "error_percentages": [round(t.error_percentage, 2) for t in topic_stats],
-                "average_time_seconds": [round(t.avg_time or 0, 2) for t in topic_stats],
-            }
-        }
 
-        # === Answer Distribution (for Pie/Bar chart) ===
-        distribution = {
-            label: UserAnswer.objects.filter(
-                attempt__user=user, selected_answer=label.lower()
-            ).count()
-            for label in ['A', 'B', 'G', 'D']
-        }
+            question_ids = [parse_int(item.get('question_id')) for item in answers if isinstance(item, dict)]
+            question_ids = [question_id for question_id in question_ids if question_id is not None]
 
-        answer_distribution_chart = {
-            "labels": list(distribution.keys()),
-            "datasets": {
-                "counts": list(distribution.values())
+            questions = {
+                question.id: question
+                for question in Question.objects.filter(quiz_id=attempt.quiz_id, id__in=question_ids)
             }
-        }
-
-        # === Topic Accuracy (Correct vs Incorrect)
-        topic_accuracy_stats = Topic.objects.annotate(
-            correct=Count(
-                'questions__useranswer',
-                filter=Q(questions__useranswer__is_correct=True, questions__useranswer__attempt__user=user)
-            ),
-            incorrect=Count(
-                'questions__useranswer',
-                filter=Q(questions__useranswer__is_correct=False, questions__useranswer__attempt__user=user)
+            answered = set(
+                UserAnswer.objects.filter(attempt=attempt, question_id__in=questions).values_list('question_id', flat=True)
             )
-        ).filter(Q(correct__gt=0) | Q(incorrect__gt=0)).order_by('-incorrect')
-
-        topic_accuracy_chart = {
-            "labels": [],
-            "datasets": {
-                "correct": [],
-                "incorrect": [],
-                "accuracy_percentage": []
-            }
-        }
 
-        for t in topic_accuracy_stats:
-            total = t.correct + t.incorrect
-            topic_accuracy_chart["labels"].append(t.name)
-            topic_accuracy_chart["datasets"]["correct"].append(t.correct)
-            topic_accuracy_chart["datasets"]["incorrect"].append(t.incorrect)
-            topic_accuracy_chart["datasets"]["accuracy_percentage"].append(percentage(t.correct, total))
-
-        # === Overall Stats ===
-        total_answers = UserAnswer.objects.filter(attempt__user=user).count()
-        total_errors = UserAnswer.objects.filter(attempt__user=user, is_correct=False).count()
-        average_time = UserAnswer.objects.filter(attempt__user=user).aggregate(
-            avg_time=Avg('time_taken')
-        )['avg_time'] or 0
-
-        overall_stats = {
-            "total_answers": total_answers,
-            "total_errors": total_errors,
-            "accuracy": percentage(total_answers - total_errors, total_answers),
-            "average_time_seconds": round(average_time, 2)
-        }
+            results = []
+            new_answers = []
+            for item in answers:
+                item = item if isinstance(item, dict) else {}
+                question_id = item.get('question_id')
+                selected_answer = item.get('selected_answer')
+                time_taken = parse_int(item.get('time_taken', 0))
+                question = questions.get(parse_int(question_id))
+
+                if question is None:
+                    results.append({'question_id': question_id, 'status': 'invalid', 'error': 'Question Doesnot exists'})
+                elif selected_answer not in valid_answers:
+                    results.append({'question_id': question_id, 'status': 'invalid', 'error': 'Invalid answer selected'})
+                elif time_taken is None or time_taken < 0:
+                    results.append({'question_id': question_id, 'status': 'invalid', 'error': 'Invalid time taken'})
+                elif question.id in answered:
+                    results.append({'question_id': question_id, 'status': 'duplicate', 'error': 'You have been answered to this question'})
+                else:
+                    answered.add(question.id)
+                    is_correct = selected_answer == question.answer
+                    new_answers.append(UserAnswer(
+                        attempt=attempt,
+                        question=question,
+                        time_taken=time_taken,
+                        selected_answer=selected_answer,
+                        is_correct=is_correct,
+                        score_earned=question.score if is_correct else 0
+                    ))
+                    results.append({
+                        'question_id': question_id,
+                        'status': 'created',
+                        'is_correct': is_correct,
+                        'score_earned': new_answers[-1].score_earned,
+                    })
+
+            if new_answers:
+                UserAnswer.objects.bulk_create(new_answers)
+                attempt.register_answers(new_answers)
+
+        if new_answers:
+            pin_to_primary(request.user.pk)
 
         return Response({
-            "overall": overall_stats,
-            "categories": categories_chart,
-            "topics": topics_chart,
-            "answer_distribution": answer_distribution_chart,
-            "topic_accuracy": topic_accuracy_chart
-        })
\ No newline at end of file
+            "results": results,
+            "updated_attempt": QuizAttemptSerializer(attempt).data,
+        })
+
+class Statistic(ReplicaReadMixin, APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        user_id = request.user.id
+        version = get_statistics_version(user_id)
+        etag = f'"{version}"'
+
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            data = get_cached_statistics(user_id, version)
+            if data is None:
+                category_rows, topic_rows = get_statistic_rows(request.user)
+                data = build_statistics(category_rows, topic_rows)
+                set_cached_statistics(user_id, version, data)
+            response = Response(data)
+
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,115 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework import status
+from core.async_views import AsyncAPIView
+from core.pagination import KeysetPagination
+from quiz.cache import aget_statistics_version, aget_cached_statistics, aset_cached_statistics
+from quiz.models.category import Category
+from quiz.models.quiz import Quiz, QuizAttempt, UserAnswer
+from quiz.serializers.quiz import QuizSerializer
+from quiz.statistics import aget_statistic_rows, build_statistics
+from quiz.content import get_quiz_content, merge_answer_state
+from quiz.views.quiz import submit_answer
+
+# Async versions of the hot endpoints in quiz.views.quiz, routed instead of
+# them when ASYNC_VIEWS is enabled and the app is served through ASGI. Each
+# one loads everything it serializes up front, so serializing never touches
+# the database from the event loop.
+
+
+async def aget_or_404(queryset, **kwargs):
+    try:
+        return await queryset.aget(**kwargs)
+    except queryset.model.DoesNotExist:
+        raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+
+
+class AsyncQuizListView(AsyncAPIView):
+    use_replica = True
+    keyset_ordering = ('-created_at', '-id')
+
+    async def get(self, request, categoryId):
+        category = await aget_or_404(Category.objects.all(), id=categoryId)
+
+        # The access map is usually cached; a miss reads the database.
+        if not await sync_to_async(category.has_access)(user=request.user):
+            return self.render(
+                {'error': 'You do not have access to this category'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        quizzes = QuizSerializer.setup_eager_loading(
+            Quiz.objects.filter(category=category),
+            request.user
+        )
+
+        quiz_type = request.GET.get('type')
+        if quiz_type:
+            quizzes = quizzes.filter(quiz_type=quiz_type)
+
+        paginator = KeysetPagination()
+        page = await paginator.apaginate_queryset(quizzes, request, view=self)
+        if page is not None:
+            serializer = QuizSerializer(page, many=True, context={'request': request})
+            return self.render(paginator.get_paginated_data(serializer.data))
+
+        quizzes = [quiz async for quiz in quizzes]
+        serializer = QuizSerializer(quizzes, many=True, context={'request': request})
+        return self.render(serializer.data)
+
+
+class AsyncQuizQuestionsView(AsyncAPIView):
+
+    async def get(self, request, attempt_id):
+        attempt = await aget_or_404(
+            QuizAttempt.objects.all(),
+            id=attempt_id,
+            user=request.user,
+            status__in=['started', 'in_progress', 'completed']
+        )
+
+        # The content is usually cached; a miss reads the questions.
+        content = await sync_to_async(get_quiz_content)(attempt.quiz_id)
+
+        user_answers = {
+            user_answer.question_id: user_answer
+            async for user_answer in UserAnswer.objects.filter(attempt=attempt)
+        }
+
+        return self.render(merge_answer_state(content, user_answers))
+
+
+class AsyncQuizAnswerView(AsyncAPIView):
+
+    async def post(self, request, attempt_id):
+        data = self.get_data(request)
+
+        # The answer is written under a row lock in a transaction, which the
+        # async ORM cannot hold; that part runs in the sync thread.
+        data, status_code = await sync_to_async(submit_answer)(request.user, attempt_id, data)
+        return self.render(data, status=status_code)
+
+
+class AsyncStatistic(AsyncAPIView):
+    use_replica = True
+
+    async def get(self, request):
+        user_id = request.user.id
+        version = await aget_statistics_version(user_id)
+        etag = f'"{version}"'
+
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = self.render(None, status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            data = await aget_cached_statistics(user_id, version)
+            if data is None:
+                category_rows, topic_rows = await aget_statistic_rows(request.user)
+                data = build_statistics(category_rows, topic_rows)
+                await aset_cached_statistics(user_id, version, data)
+            response = self.render(data)
+
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response